@@ -1,22 +1,62 @@
 from db_connector import DBConnector
-import random
+from query_generator import QueryGenerator, TextQueryGenerator
+from tracing import QueryTracer, append_breakdown
+from resource_usage import merge_resources
 import time
 import logging
 import csv
 from datetime import datetime
 import os
 from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 import statistics
+import json
+import glob
+import numpy as np
 
 class BenchmarkRunner:
     """Manages the benchmarking process."""
 
-    def __init__(self, tables, query_configs, dimensions, db_config):
+    DEFAULT_SESSION_SETTINGS = {
+        # Memory settings
+        "work_mem": "256MB",  # Allocate more memory per query
+        "effective_cache_size": "24GB",  # Help query planner use OS cache
+        # Parallel execution settings
+        "max_parallel_workers_per_gather": 6,
+        "parallel_tuple_cost": 0.1,
+        "parallel_setup_cost": 50,
+        # Optimize for multi-client workloads settings
+        "idle_in_transaction_session_timeout": "5min",  # Close idle connections
+        "statement_timeout": "300000",  # Prevent long-running queries from blocking
+    }
+
+    def __init__(self, tables, query_configs, dimensions, db_config, query_distribution=None,
+                 ground_truth_table=None, top_k=5, query_types=None, hybrid_config=None,
+                 num_tenants=None, recall_sample=0, tracing_config=None, resource_samples=None,
+                 session_settings=None):
         self.tables = tables
         self.query_configs = query_configs
         self.dimensions = dimensions
+        self.query_generator = QueryGenerator(dimensions, query_distribution)
+        self.query_types = query_types or ["vector"]
+        self.hybrid_config = hybrid_config or {}
+        self.text_query_generator = TextQueryGenerator(self.hybrid_config, self.hybrid_config.get("seed", 0))
+        self.ground_truth_table = ground_truth_table
+        self.ground_truth = None
+        self.top_k = top_k
+        self.num_tenants = num_tenants
+        configured_types = set(self.query_types).union(*(config.get("query_types", []) for config in query_configs))
+        if "tenant" in configured_types and not num_tenants:
+            raise ValueError("tenant queries need the number of tenants; set tenants in config.json.")
+        self.recall_sample = recall_sample
+        self.tracing_config = tracing_config or {}
+        self.tracer = QueryTracer(self.tracing_config.get("sample_rate", 0.1))
+        self.server_timing = self.tracing_config.get("server_timing", "explain")
+        self.resource_samples = resource_samples
+        self.session_settings = self.DEFAULT_SESSION_SETTINGS if session_settings is None else session_settings
         self.results = []
         self.db = DBConnector(db_config)
+        self.connection_lock = Lock()
         self.executor = None
 
         # Create a folder to store logs and results
@@ -26,6 +66,7 @@ class BenchmarkRunner:
         current_time = datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
         self.benchmark_result_folder = os.path.join("results", f"benchmark_{current_time}")
         self.latencies_folder = os.path.join(self.benchmark_result_folder, "latencies")
+        self.breakdown_folder = os.path.join(self.benchmark_result_folder, "breakdown")
 
         if not os.path.exists(self.benchmark_result_folder):
             os.makedirs(self.benchmark_result_folder)
@@ -33,6 +74,9 @@ class BenchmarkRunner:
         if not os.path.exists(self.latencies_folder):
             os.makedirs(self.latencies_folder)
 
+        if not os.path.exists(self.breakdown_folder):
+            os.makedirs(self.breakdown_folder)
+
         # Set up logging
         log_file_path = os.path.join(self.benchmark_result_folder, f"query_benchmark_{current_time}.log")
         logging.basicConfig(
@@ -44,34 +88,264 @@ class BenchmarkRunner:
             ]
         )
         self.results_file = os.path.join(self.benchmark_result_folder, f"benchmark_results_{current_time}.csv")
+        self.breakdown_file = os.path.join(self.benchmark_result_folder, f"latency_breakdown_{current_time}.csv")
 
-    def generate_query_vector(self):
-        """Generate a random query vector."""
-        return [round(random.uniform(0, 1), 2) for _ in range(self.dimensions)]
+    def load_ground_truth(self):
+        """Load the imported ground truth queries and their true nearest neighbour ids."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute(f"SELECT query::text, neighbors FROM {self.ground_truth_table} ORDER BY id;")
+            self.ground_truth = cursor.fetchall()
+        logging.info(f"Loaded {len(self.ground_truth)} ground truth queries from {self.ground_truth_table}.")
 
-    def run_query(self, table_name):
-        """Execute a single query and measure elapsed time."""
-        query_vector = self.generate_query_vector()
-        query_vector_str = "[" + ",".join(map(str, query_vector)) + "]"
+    def check_query_distribution(self):
+        """
+        Compare the first generated queries with the ones the data generator stored.
+        QueryGenerator rebuilds the generator's mixture on its own, so a mismatch means the two copies
+        or the two configurations diverged and the queries no longer come from the data's distribution.
+        """
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SELECT to_regclass('generator_query_probe');")
+            if cursor.fetchone()[0] is None:
+                logging.warning("The database has no generator_query_probe table; cannot check that queries match the data.")
+                return
+            cursor.execute("SELECT query FROM generator_query_probe ORDER BY id;")
+            expected = np.array([row[0] for row in cursor.fetchall()], dtype=np.float32)
+
+        actual = self.query_generator.generate(len(expected), index=0)
+        if expected.shape != actual.shape or not np.allclose(expected, actual, atol=1e-4):
+            raise ValueError(
+                "Generated queries do not match the data generator's: check that query_distribution "
+                "mirrors the generator's distribution and seed."
+            )
+        logging.info("Query distribution matches the data generator's.")
 
-        try:
-            cursor = self.db.get_cursor()
-            start_time = time.time()
-            cursor.execute(
-                f"""
-                SELECT id, embedding <-> %s::VECTOR AS distance
+    def get_queries(self, num_queries, warm_up):
+        """
+        Return one parameter dict per query: embedding, text, tenant and the true neighbour ids if known.
+        With ground truth, its queries are cycled through; otherwise vectors are generated.
+        """
+        # Warm-up draws from a separate stream so it does not pre-cache the measured queries.
+        stream = 1 if warm_up else 0
+        text_queries = self.text_query_generator.generate(num_queries, index=stream)
+        tenants = self.query_generator.generate_tenants(num_queries, self.num_tenants, index=stream)
+
+        if self.ground_truth:
+            ground_truth = [self.ground_truth[i % len(self.ground_truth)] for i in range(num_queries)]
+        else:
+            query_vectors = self.query_generator.generate_literals(num_queries, index=stream)
+            ground_truth = [(query_vector, None) for query_vector in query_vectors]
+
+        return [
+            {"embedding": query_vector, "text": text_query, "tenant": tenant, "true_ids": true_ids}
+            for (query_vector, true_ids), text_query, tenant in zip(ground_truth, text_queries, tenants)
+        ]
+
+    def build_query(self, table_name, query_type):
+        """
+        Build the SQL for a query type: 'vector' kNN, 'tenant' kNN scoped to one tenant,
+        'text' full-text ranking, or 'hybrid' reciprocal rank fusion of a kNN CTE and a full-text CTE.
+        The hybrid CTEs rank only their LIMITed candidates, since a window function over the whole
+        table would stop PostgreSQL from using a bounded top-N sort.
+        On a partitioned table, 'vector' merges the per-partition top-k into the global top-k
+        and 'tenant' is pruned to the tenant's partition.
+        """
+        if query_type == "vector":
+            return f"""
+                SELECT id, embedding <-> %(embedding)s::VECTOR AS distance
                 FROM {table_name}
                 ORDER BY distance
-                LIMIT 5;
-                """,
-                [query_vector_str],
-            )
-            cursor.fetchall()
-            elapsed_time = time.time() - start_time
-            return elapsed_time, True  # (latency, success_boolean)
+                LIMIT {self.top_k};
+                """
+
+        if query_type == "tenant":
+            return f"""
+                SELECT id, embedding <-> %(embedding)s::VECTOR AS distance
+                FROM {table_name}
+                WHERE tenant_id = %(tenant)s
+                ORDER BY distance
+                LIMIT {self.top_k};
+                """
+
+        language = self.hybrid_config.get("language", "simple")
+        if query_type == "text":
+            return f"""
+                SELECT id, ts_rank_cd(content_tsv, query) AS score
+                FROM {table_name}, to_tsquery('{language}', %(text)s) query
+                WHERE content_tsv @@ query
+                ORDER BY score DESC
+                LIMIT {self.top_k};
+                """
+
+        if query_type == "hybrid":
+            candidates = self.hybrid_config.get("candidates", 40)
+            rrf_k = self.hybrid_config.get("rrf_k", 60)
+            return f"""
+                WITH semantic AS (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY distance) AS rank
+                    FROM (
+                        SELECT id, embedding <-> %(embedding)s::VECTOR AS distance
+                        FROM {table_name}
+                        ORDER BY embedding <-> %(embedding)s::VECTOR
+                        LIMIT {candidates}
+                    ) candidates
+                ),
+                keyword AS (
+                    SELECT id, ROW_NUMBER() OVER (ORDER BY text_rank DESC) AS rank
+                    FROM (
+                        SELECT id, ts_rank_cd(content_tsv, query) AS text_rank
+                        FROM {table_name}, to_tsquery('{language}', %(text)s) query
+                        WHERE content_tsv @@ query
+                        ORDER BY ts_rank_cd(content_tsv, query) DESC
+                        LIMIT {candidates}
+                    ) candidates
+                )
+                SELECT COALESCE(semantic.id, keyword.id) AS id,
+                       COALESCE(1.0 / ({rrf_k} + semantic.rank), 0.0) +
+                       COALESCE(1.0 / ({rrf_k} + keyword.rank), 0.0) AS score
+                FROM semantic
+                FULL OUTER JOIN keyword ON semantic.id = keyword.id
+                ORDER BY score DESC
+                LIMIT {self.top_k};
+                """
+
+        raise ValueError(f"Unknown query type: {query_type}")
+
+    def run_query(self, table_name, query, query_type="vector", query_index=0, submitted_ns=None):
+        """
+        Execute a single query and measure elapsed time with the monotonic clock.
+        The latency covers parameter encoding, execution and result decoding; sampled queries are traced.
+        """
+        try:
+            started_ns = time.perf_counter_ns()
+            cursor = self.db.get_cursor()
+            cursor_ready_ns = time.perf_counter_ns()
+            sql = cursor.mogrify(self.build_query(table_name, query_type), query)
+            encoded_ns = time.perf_counter_ns()
+            # The workers share one connection; taking its turn explicitly lets the wait be timed apart from execution.
+            with self.connection_lock:
+                acquired_ns = time.perf_counter_ns()
+                cursor.execute(sql)
+                executed_ns = time.perf_counter_ns()
+            rows = cursor.fetchall()
+            decoded_ns = time.perf_counter_ns()
+
+            if submitted_ns is not None and self.tracer.should_trace(query_index):
+                self.tracer.record(query_index, submitted_ns, started_ns, encoded_ns, acquired_ns, executed_ns, decoded_ns)
+
+            elapsed_time = (decoded_ns - cursor_ready_ns) / 1e9
+            return elapsed_time, True, [row[0] for row in rows]  # (latency, success_boolean, result ids)
         except Exception as e:
             logging.error(f"Error running query on {table_name}: {e}")
-            return None, False  # Failure
+            return None, False, None  # Failure
+
+    def compute_recall(self, result_ids, true_ids):
+        """Recall@k of one query's results against its true nearest neighbours."""
+        expected = set(true_ids[:self.top_k])
+        return len(expected.intersection(result_ids)) / len(expected) if expected else None
+
+    def exact_ids(self, table_name, query, query_type):
+        """Run a kNN query with index scans disabled, which makes it an exact search."""
+        with self.db.get_cursor() as cursor:
+            cursor.execute("SET enable_indexscan = off;")
+            try:
+                cursor.execute(self.build_query(table_name, query_type), query)
+                return [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.execute("RESET enable_indexscan;")
+
+    def sample_recall(self, table_name, query_type, queries, result_ids):
+        """
+        Recall of the first `recall_sample` answered queries against an exact search, run after the timed section.
+        Used when the bundled ground truth does not apply: generated queries or tenant-scoped search.
+        """
+        recalls = []
+        for query, ids in zip(queries, result_ids):
+            if len(recalls) >= self.recall_sample:
+                break
+            if ids is not None:
+                recalls.append(self.compute_recall(ids, self.exact_ids(table_name, query, query_type)))
+        recalls = [recall for recall in recalls if recall is not None]
+        return sum(recalls) / len(recalls) if recalls else None
+
+    def read_pg_stat_statements(self, table_name):
+        """Cumulative (calls, execution + planning ms) of the statements on a table, or None without the extension."""
+        with self.db.get_cursor() as cursor:
+            # A savepoint confines a failure to this probe instead of the session's transaction.
+            cursor.execute("SAVEPOINT pg_stat_statements_probe;")
+            try:
+                cursor.execute(
+                    """
+                    SELECT COALESCE(SUM(calls), 0), COALESCE(SUM(total_exec_time + total_plan_time), 0)
+                    FROM pg_stat_statements
+                    WHERE query LIKE %s AND query NOT LIKE 'EXPLAIN%%';
+                    """,
+                    [f"%FROM {table_name}%"],
+                )
+                row = cursor.fetchone()
+                cursor.execute("RELEASE SAVEPOINT pg_stat_statements_probe;")
+                return row
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT pg_stat_statements_probe;")
+                logging.warning(f"pg_stat_statements is unavailable, falling back to EXPLAIN ANALYZE sampling: {e}")
+                self.server_timing = "explain"
+                return None
+
+    def explain_server_time(self, table_name, query_type, queries):
+        """
+        Mean server planning + execution time in ms, from EXPLAIN ANALYZE of up to `explain_sample` traced queries.
+        Per-node timing is off, since its clock reads inflate scans over many rows beyond the query's real cost.
+        """
+        explain_sample = self.tracing_config.get("explain_sample", 20)
+        server_times = []
+        with self.db.get_cursor() as cursor:
+            # As with the pg_stat_statements probe, a failure such as a statement timeout only loses the server time.
+            cursor.execute("SAVEPOINT explain_server_time;")
+            try:
+                for query_index in self.tracer.traced_indices()[:explain_sample]:
+                    cursor.execute(
+                        "EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) " + self.build_query(table_name, query_type),
+                        queries[query_index],
+                    )
+                    plan = cursor.fetchone()[0]
+                    plan = json.loads(plan)[0] if isinstance(plan, str) else plan[0]
+                    server_times.append(plan["Planning Time"] + plan["Execution Time"])
+                cursor.execute("RELEASE SAVEPOINT explain_server_time;")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT explain_server_time;")
+                logging.warning(f"EXPLAIN ANALYZE sampling failed for {table_name} ({query_type}), no server time for this run: {e}")
+                return None
+        return statistics.fmean(server_times) if server_times else None
+
+    def save_breakdown(self, table_name, query_type, num_queries, num_clients, queries, server_before):
+        """Measure server time, then write the per-query traces and append this run's row to the breakdown table."""
+        server_ms = None
+        if self.server_timing == "pg_stat_statements" and server_before is not None:
+            server_after = self.read_pg_stat_statements(table_name)
+            if server_after is not None and server_after[0] > server_before[0]:
+                server_ms = float(server_after[1] - server_before[1]) / float(server_after[0] - server_before[0])
+        if self.server_timing == "explain" and server_ms is None:
+            server_ms = self.explain_server_time(table_name, query_type, queries)
+
+        run_name = self.run_name(table_name, query_type, num_queries, num_clients)
+        self.tracer.save(os.path.join(self.breakdown_folder, f"{run_name}_trace.csv"))
+
+        summary = self.tracer.summarize(server_ms)
+        append_breakdown(self.breakdown_file, {
+            "table_name": table_name,
+            "query_type": query_type,
+            "num_queries": num_queries,
+            "num_clients": num_clients,
+            "server_timing": self.server_timing,
+            **summary,
+        })
+
+        if summary["traced_queries"]:
+            logging.info(
+                f"Breakdown for {table_name} ({query_type}): queue_wait={summary['queue_wait_mean_ms']:.2f}ms, "
+                f"encode={summary['encode_mean_ms']:.3f}ms, connection_wait={summary['connection_wait_mean_ms']:.2f}ms, "
+                f"execute={summary['execute_mean_ms']:.2f}ms, decode={summary['decode_mean_ms']:.3f}ms"
+                + (f", server={server_ms:.2f}ms, unattributed={summary['unattributed_mean_ms']:.2f}ms" if server_ms is not None else "")
+            )
 
     def compute_latency_stats(self, latencies):
         """Compute extended latency stats from a list of latencies."""
@@ -122,51 +396,70 @@ class BenchmarkRunner:
         }
 
     def apply_postgresql_settings(self):
-        """Optimize PostgreSQL settings for high-concurrency query benchmarking."""
+        """
+        Optimize PostgreSQL settings for high-concurrency query benchmarking.
+        `session_settings` replaces the defaults; an empty block leaves every setting to the server's postgresql.conf.
+        """
         with self.db.get_cursor() as cursor:
-            # Memory settings
-            cursor.execute("SET work_mem = '256MB';")  # Allocate more memory per query
-            cursor.execute("SET effective_cache_size = '24GB';")  # Help query planner use OS cache
-
-            # Parallel execution settings
-            cursor.execute("SET max_parallel_workers_per_gather = 6;")
-            cursor.execute("SET parallel_tuple_cost = 0.1;")
-            cursor.execute("SET parallel_setup_cost = 50;")
-            cursor.execute("SET force_parallel_mode = 'off';")  # Let PostgreSQL decide best parallelism
-
-            # Optimize for multi-client workloads settings
-            cursor.execute("SET idle_in_transaction_session_timeout = '5min';")  # Close idle connections
-            cursor.execute("SET statement_timeout = '300000';")  # Prevent long-running queries from blocking
-            logging.info("Applied PostgreSQL settings for multi-client benchmarking.")
-
-    def run_benchmark(self, table_name, num_queries, num_clients, warm_up=False):
+            for name, value in self.session_settings.items():
+                cursor.execute(f"SET {name} = %s;", (str(value),))
+            # force_parallel_mode was renamed to debug_parallel_query in PostgreSQL 16.
+            cursor.execute("SHOW server_version_num;")
+            parallel_mode = "force_parallel_mode" if int(cursor.fetchone()[0]) < 160000 else "debug_parallel_query"
+            cursor.execute(f"SET {parallel_mode} = 'off';")  # Let PostgreSQL decide best parallelism
+        # Commit, so a later rollback cannot undo the session settings.
+        self.db.conn.commit()
+        logging.info("Applied PostgreSQL settings for multi-client benchmarking.")
+
+    def run_benchmark(self, table_name, num_queries, num_clients, warm_up=False, query_type="vector"):
         """
-        Run the benchmark for a single table with the given concurrency.
+        Run the benchmark for a single table with the given concurrency and query type.
         If warm_up=True, Do these queries but don't store final stats in self.results.
         """
         label = "Warm-up" if warm_up else "Benchmark"
-        logging.info(f"{label} for {table_name} with {num_queries} queries and {num_clients} clients...")
+        logging.info(f"{label} for {table_name} with {num_queries} {query_type} queries and {num_clients} clients...")
+
+        # Queries are prepared up front so generation cost stays out of the measured latencies,
+        # and every table sees the same query set.
+        queries = self.get_queries(num_queries, warm_up)
+
+        server_before = None
+        if not warm_up and self.server_timing == "pg_stat_statements":
+            server_before = self.read_pg_stat_statements(table_name)
+        self.tracer.start_run()
 
-        start_time = time.time()
+        start_time = time.perf_counter()
+        # Wall-clock bounds of the run, for aligning the server's resource samples.
+        start_timestamp = time.time()
 
         latencies = []
+        recalls = []
+        result_ids = []
         success_count = 0
         failure_count = 0
 
         # Create or reuse executor
         with ThreadPoolExecutor(max_workers=num_clients) as executor:
-            futures = [executor.submit(self.run_query, table_name) for _ in range(num_queries)]
-            for future in futures:
-                elapsed, success = future.result()
+            futures = [
+                executor.submit(self.run_query, table_name, query, query_type, i, time.perf_counter_ns())
+                for i, query in enumerate(queries)
+            ]
+            for future, query in zip(futures, queries):
+                elapsed, success, ids = future.result()
+                result_ids.append(ids)
                 if success:
                     success_count += 1
                     latencies.append(elapsed)
+                    # Ground truth is for unscoped kNN; fused or tenant-scoped results are not comparable to it.
+                    if query["true_ids"] and query_type == "vector":
+                        recalls.append(self.compute_recall(ids, query["true_ids"]))
                 else:
                     failure_count += 1
 
         success_rate = (success_count / num_queries) * 100 if num_queries else 0
         failure_rate = (failure_count / num_queries) * 100 if num_queries else 0
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
+        end_timestamp = start_timestamp + elapsed_time
 
         # Log basic stats
         if warm_up:
@@ -176,18 +469,24 @@ class BenchmarkRunner:
 
         # Compute extended stats
         stats = self.compute_latency_stats(latencies)
+        recall = sum(recalls) / len(recalls) if recalls else None
+        self.save_breakdown(table_name, query_type, num_queries, num_clients, queries, server_before)
+        if recall is None and self.recall_sample and query_type in ("vector", "tenant"):
+            recall = self.sample_recall(table_name, query_type, queries, result_ids)
 
         # Log results
         logging.info(
-            f"Results for {table_name}: avg_latency={stats['avg_latency']:.4f}s, "
+            f"Results for {table_name} ({query_type}): avg_latency={stats['avg_latency']:.4f}s, "
             f"p50={stats['p50_latency']:.4f}s, p90={stats['p90_latency']:.4f}s, "
             f"throughput={stats['throughput']:.2f} q/s, "
-            f"success_rate={success_rate:.2f}%, failure_rate={failure_rate:.2f}%, elapsed={elapsed_time:.2f}s"
+            + (f"recall@{self.top_k}={recall:.4f}, " if recall is not None else "")
+            + f"success_rate={success_rate:.2f}%, failure_rate={failure_rate:.2f}%, elapsed={elapsed_time:.2f}s"
         )
 
         # Return a dict that will be appended to self.results
         result_entry = {
             "table_name": table_name,
+            "query_type": query_type,
             "num_queries": num_queries,
             "num_clients": num_clients,
             "avg_latency": stats["avg_latency"],
@@ -199,9 +498,13 @@ class BenchmarkRunner:
             "p99_latency": stats["p99_latency"],
             "stddev_latency": stats["stddev_latency"],
             "throughput": stats["throughput"],
+            "recall": recall,
             "success_rate": success_rate,
             "failure_rate": failure_rate,
             "elapsed_time": elapsed_time,
+            "run_id": self.run_name(table_name, query_type, num_queries, num_clients),
+            "start_timestamp": start_timestamp,
+            "end_timestamp": end_timestamp,
             "latencies": latencies
         }
         return result_entry
@@ -238,18 +541,25 @@ class BenchmarkRunner:
 
         logging.info(f"Appended result for {result_entry['table_name']} to CSV.")
 
+    def run_name(self, table_name, query_type, num_queries, num_clients):
+        """Name used for a run's per-run files. Pure vector runs keep the original names."""
+        suffix = "" if query_type == "vector" else f"_{query_type}"
+        return f"{table_name}_{num_queries}q_{num_clients}c{suffix}"
+
     def save_latencies(self, result_entry):
         """Save latencies to a separate file for further analysis."""
         table_name = result_entry["table_name"]
         latencies = result_entry["latencies"]
         num_queries = result_entry["num_queries"]
         num_clients = result_entry["num_clients"]
+        query_type = result_entry["query_type"]
 
         if not latencies:
             logging.info(f"No latencies to save for {table_name}.")
             return
 
-        latencies_file = os.path.join(self.latencies_folder, f"{table_name}_{num_queries}q_{num_clients}c_latencies.csv")
+        run_name = self.run_name(table_name, query_type, num_queries, num_clients)
+        latencies_file = os.path.join(self.latencies_folder, f"{run_name}_latencies.csv")
         with open(latencies_file, mode="w", newline="") as file:
             writer = csv.writer(file)
             writer.writerow(latencies)
@@ -257,6 +567,17 @@ class BenchmarkRunner:
         logging.info(f"Latencies saved to {latencies_file} for {table_name}.")
 
 
+    def merge_resource_samples(self):
+        """Merge the server's resource samples into the results, when the sampler's files are readable from here."""
+        if not os.path.isfile(self.results_file):
+            logging.info("No results were written, so there is nothing to merge resource samples into.")
+            return
+        paths = sorted(glob.glob(self.resource_samples))
+        if not paths:
+            logging.warning(f"No resource samples found at {self.resource_samples}.")
+            return
+        merge_resources(self.results_file, paths)
+
     def shutdown(self):
         """Close DB connection and log final message."""
         self.db.close()
@@ -267,25 +588,36 @@ class BenchmarkRunner:
         try:
             self.db.connect()
             self.apply_postgresql_settings()
+            if self.ground_truth_table:
+                self.load_ground_truth()
+            else:
+                self.check_query_distribution()
 
             for config in self.query_configs:
                 warm_up = config.get("warm_up", False)
                 num_queries = config["num_queries"]
                 num_clients = config["num_clients"]
 
-                for table_name in self.tables:
-                    result = self.run_benchmark(
-                        table_name=table_name,
-                        num_queries=num_queries,
-                        num_clients=num_clients,
-                        warm_up=warm_up
-                    )
-                    
-                    if result:
-                        self.results.append(result)
-                        self.append_result_to_csv(result)
-                        self.save_latencies(result)
+                query_types = config.get("query_types", self.query_types)
 
+                for table_name in self.tables:
+                    # Every query type runs against the same table at the same concurrency.
+                    for query_type in query_types:
+                        result = self.run_benchmark(
+                            table_name=table_name,
+                            num_queries=num_queries,
+                            num_clients=num_clients,
+                            warm_up=warm_up,
+                            query_type=query_type
+                        )
+
+                        if result:
+                            self.results.append(result)
+                            self.append_result_to_csv(result)
+                            self.save_latencies(result)
+
+            if self.resource_samples:
+                self.merge_resource_samples()
 
         finally:
             self.shutdown()
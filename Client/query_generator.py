@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class QueryGenerator:
+    """
+    Generates query vectors from the same distribution the server's data was generated with.
+    The mixture is rebuilt from the shared seed, in the same order as Server/embedding_generator.py,
+    so the client never needs the data itself.
+    """
+
+    def __init__(self, dimensions, distribution=None):
+        self.dimensions = dimensions
+        self.distribution = distribution or {"type": "uniform"}
+        self.type = self.distribution.get("type", "uniform")
+        self.seed = self.distribution.get("seed", 0)
+
+        if self.type == "clustered":
+            self.build_mixture()
+        elif self.type != "uniform":
+            raise ValueError(f"Unknown distribution type: {self.type}")
+
+    def build_mixture(self):
+        """Rebuild the generator's Gaussian mixture from the shared seed."""
+        num_clusters = self.distribution.get("num_clusters", 100)
+        intrinsic_dim = min(self.distribution.get("intrinsic_dim", self.dimensions), self.dimensions)
+        rng = np.random.default_rng([self.seed, 0])
+
+        self.weights = rng.dirichlet(np.ones(num_clusters))
+        self.centers = rng.normal(0.0, self.distribution.get("center_spread", 1.0), (num_clusters, intrinsic_dim))
+        self.scales = self.distribution.get("cluster_std", 0.1) * rng.lognormal(
+            0.0, self.distribution.get("anisotropy", 0.5), (num_clusters, intrinsic_dim)
+        )
+        q, _ = np.linalg.qr(rng.normal(size=(self.dimensions, intrinsic_dim)))
+        self.basis = q.T.astype(np.float32)
+
+    def generate(self, count, index=0):
+        """Generate `count` query vectors; the same index always yields the same queries."""
+        rng = np.random.default_rng([self.seed, 2, index])
+
+        if self.type == "uniform":
+            return np.round(rng.uniform(0, 1, (count, self.dimensions)), 2).astype(np.float32)
+
+        labels = rng.choice(len(self.weights), size=count, p=self.weights)
+        latent = self.centers[labels] + rng.normal(size=(count, self.centers.shape[1])) * self.scales[labels]
+        vectors = latent.astype(np.float32) @ self.basis
+
+        noise_std = self.distribution.get("noise_std", 0.0) + self.distribution.get("query_noise", 0.0)
+        if noise_std > 0:
+            vectors += rng.normal(0.0, noise_std, vectors.shape).astype(np.float32)
+
+        if self.distribution.get("normalize", False):
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+        return vectors
+
+    def generate_tenants(self, count, num_tenants, index=0):
+        """Generate the tenant each query is scoped to, uniformly like the server assigns rows."""
+        if not num_tenants:
+            return [None] * count
+        return np.random.default_rng([self.seed, 5, index]).integers(0, num_tenants, count).tolist()
+
+    def generate_literals(self, count, index=0):
+        """Generate query vectors as pgvector '[x,y,...]' literals."""
+        return ["[" + ",".join(f"{x:.6g}" for x in vector) + "]" for vector in self.generate(count, index)]
+
+
+class TextQueryGenerator:
+    """Generates full-text search terms from the same Zipf vocabulary as the server's synthetic documents."""
+
+    def __init__(self, hybrid_config, seed=0):
+        self.seed = seed
+        self.vocabulary_size = hybrid_config.get("vocabulary_size", 10000)
+        self.terms_per_query = hybrid_config.get("terms_per_query", 2)
+        ranks = np.arange(1, self.vocabulary_size + 1)
+        weights = 1.0 / ranks ** hybrid_config.get("zipf_exponent", 1.1)
+        self.probabilities = weights / weights.sum()
+
+    def generate(self, count, index=0):
+        """Generate `count` tsquery strings matching any of their terms; the same index always yields the same queries."""
+        rng = np.random.default_rng([self.seed, 4, index])
+        word_ids = rng.choice(self.vocabulary_size, size=(count, self.terms_per_query), p=self.probabilities)
+        return [" | ".join(f"w{word_id}" for word_id in row) for row in word_ids]
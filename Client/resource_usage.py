@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import argparse
+import csv
+import glob
+import logging
+import os
+import statistics
+
+# Per-run aggregates of the server's resource samples: (column, aggregate) pairs.
+AGGREGATES = [
+    ("cpu_busy_pct", "mean"), ("cpu_busy_pct", "max"),
+    ("cpu_iowait_pct", "mean"), ("cpu_iowait_pct", "max"),
+    ("cpu_steal_pct", "mean"),
+    ("pg_cpu_cores", "mean"), ("pg_cpu_cores", "max"),
+    ("pg_parallel_workers", "mean"), ("pg_parallel_workers", "max"),
+    ("pg_running", "mean"), ("pg_blocked", "mean"),
+    ("pg_rss_mb", "max"),
+    ("disk_read_mbps", "mean"), ("disk_write_mbps", "mean"),
+    ("disk_read_iops", "mean"), ("disk_util_pct", "mean"), ("disk_util_pct", "max"),
+    ("mem_available_mb", "min"),
+    ("swap_in_per_s", "mean"), ("major_faults_per_s", "mean"),
+    ("net_rx_mbps", "mean"), ("net_tx_mbps", "mean"),
+]
+AGGREGATE_FUNCTIONS = {"mean": statistics.fmean, "max": max, "min": min}
+
+# Thresholds of the bottleneck hint, on the run's mean utilisation.
+CPU_BOUND_PCT = 85.0
+IOWAIT_BOUND_PCT = 20.0
+DISK_BOUND_UTIL_PCT = 80.0
+
+
+def load_samples(paths):
+    """Read the resource sampler's CSV files into one list of rows with float values, ordered by timestamp."""
+    samples = []
+    for path in paths:
+        with open(path, newline="") as file:
+            for row in csv.DictReader(file):
+                samples.append({key: float(value) for key, value in row.items() if value != ""})
+    samples.sort(key=lambda sample: sample["timestamp"])
+    return samples
+
+
+def run_samples(samples, start, end):
+    """Samples whose interval overlaps the run, so even runs shorter than one interval get a sample."""
+    return [
+        sample for sample in samples
+        if sample["timestamp"] > start and sample["timestamp"] - sample["interval"] < end
+    ]
+
+
+def summarize_run(samples):
+    """Aggregate a run's samples into the resource columns added to its results row."""
+    summary = {"resource_samples": len(samples)}
+    for column, aggregate in AGGREGATES:
+        values = [sample[column] for sample in samples if column in sample]
+        summary[f"{column}_{aggregate}"] = round(AGGREGATE_FUNCTIONS[aggregate](values), 3) if values else None
+    summary["bottleneck"] = bottleneck(summary) if samples else None
+    return summary
+
+
+def bottleneck(summary):
+    """A first hint at what limited the run, from its mean utilisation. Confirm against the time series."""
+    if summary["cpu_busy_pct_mean"] is not None and summary["cpu_busy_pct_mean"] >= CPU_BOUND_PCT:
+        return "cpu"
+    if (summary["cpu_iowait_pct_mean"] or 0) >= IOWAIT_BOUND_PCT or (summary["disk_util_pct_mean"] or 0) >= DISK_BOUND_UTIL_PCT:
+        return "io"
+    return "none"
+
+
+def merge_resources(results_file, sample_paths, clock_offset=0.0):
+    """
+    Align the server's resource samples with the runs in a results file, using each run's wall-clock
+    start and end. `clock_offset` (server clock minus client clock, in seconds) corrects for clock skew.
+    Writes the results with per-run resource columns next to the results file, plus the samples
+    labelled with their run_id, and returns both paths.
+    """
+    samples = load_samples(sample_paths)
+    with open(results_file, newline="") as file:
+        results = list(csv.DictReader(file))
+    if not samples or not results:
+        logging.warning(f"Nothing to merge: {len(samples)} resource samples, {len(results)} results.")
+        return None, None
+
+    merged_rows, labelled = [], []
+    for result in results:
+        if not result.get("start_timestamp"):
+            logging.warning(f"{result['table_name']} has no run timestamps, skipping it.")
+            continue
+        start = float(result["start_timestamp"]) + clock_offset
+        end = float(result["end_timestamp"]) + clock_offset
+        matched = run_samples(samples, start, end)
+        if not matched:
+            logging.warning(f"No resource samples cover run {result['run_id']}.")
+
+        merged_rows.append({**result, **summarize_run(matched)})
+        for sample in matched:
+            labelled.append({
+                "run_id": result["run_id"],
+                "run_elapsed": round(sample["timestamp"] - start, 3),
+                "throughput": result["throughput"],
+                "num_clients": result["num_clients"],
+                **sample,
+            })
+
+    base = os.path.splitext(results_file)[0]
+    merged_path, series_path = f"{base}_resources.csv", f"{base}_resource_series.csv"
+    for path, rows in ((merged_path, merged_rows), (series_path, labelled)):
+        if not rows:
+            continue
+        with open(path, mode="w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    logging.info(f"Merged {len(labelled)} resource samples into {len(merged_rows)} runs: {merged_path}, {series_path}.")
+    return merged_path, series_path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Merge the server's resource samples into a benchmark results file.")
+    parser.add_argument("results_file", help="benchmark_results_<time>.csv written by BenchmarkRunner")
+    parser.add_argument("samples", nargs="+", help="Resource sampler CSV files (globs are expanded)")
+    parser.add_argument("--clock-offset", type=float, default=0.0, help="Server clock minus client clock, in seconds")
+    args = parser.parse_args()
+
+    paths = sorted(path for pattern in args.samples for path in glob.glob(pattern))
+    merge_resources(args.results_file, paths, args.clock_offset)
@@ -48,7 +48,17 @@ if __name__ == "__main__":
             tables=tables,
             query_configs=query_configs,
             dimensions=dimensions,
-            db_config=db_config
+            db_config=db_config,
+            query_distribution=benchmark_config.get("query_distribution"),
+            ground_truth_table=benchmark_config.get("ground_truth_table"),
+            top_k=benchmark_config.get("top_k", 5),
+            query_types=benchmark_config.get("query_types"),
+            hybrid_config=benchmark_config.get("hybrid"),
+            num_tenants=benchmark_config.get("tenants"),
+            recall_sample=benchmark_config.get("recall_sample", 0),
+            tracing_config=benchmark_config.get("tracing"),
+            resource_samples=benchmark_config.get("resource_samples"),
+            session_settings=benchmark_config.get("session_settings")
         )
         benchmark_runner.start()
 
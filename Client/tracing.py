@@ -0,0 +1,92 @@
+import csv
+import os
+import statistics
+
+
+class QueryTracer:
+    """
+    Records where the time of a sampled query goes, using time.perf_counter_ns() timestamps:
+    - queue_wait: submitted to the executor until a worker picks it up
+    - encode: binding the parameters into the SQL text
+    - connection_wait: waiting for the connection, which all workers share and which runs one query at a time
+    - execute: sending the query until the complete result is buffered by libpq
+      (server execution + network + protocol; for top-k result sets this is the time to first byte)
+    - decode: converting the buffered result into Python objects
+    Every `1 / sample_rate`-th query is traced, so untraced queries only pay for the timestamps.
+    """
+
+    COMPONENTS = ("queue_wait", "encode", "connection_wait", "execute", "decode", "total")
+
+    def __init__(self, sample_rate=0.1):
+        self.every = max(1, round(1 / sample_rate)) if sample_rate > 0 else 0
+        self.records = []
+
+    def should_trace(self, query_index):
+        return bool(self.every) and query_index % self.every == 0
+
+    def start_run(self):
+        """Forget the records of the previous run."""
+        self.records = []
+
+    def record(self, query_index, submitted_ns, started_ns, encoded_ns, acquired_ns, executed_ns, decoded_ns):
+        """Record one traced query. list.append is atomic, so worker threads can call this directly."""
+        self.records.append({
+            "query_index": query_index,
+            "queue_wait": (started_ns - submitted_ns) / 1e6,
+            "encode": (encoded_ns - started_ns) / 1e6,
+            "connection_wait": (acquired_ns - encoded_ns) / 1e6,
+            "execute": (executed_ns - acquired_ns) / 1e6,
+            "decode": (decoded_ns - executed_ns) / 1e6,
+            "total": (decoded_ns - submitted_ns) / 1e6,
+        })
+
+    def traced_indices(self):
+        return [record["query_index"] for record in self.records]
+
+    def summarize(self, server_ms=None):
+        """
+        Mean, p50 and p99 in milliseconds of every component over the traced queries.
+        Given the mean server time, the rest of `execute` is reported as unattributed: network and protocol,
+        but also any difference between how the server time was measured and the load the traced queries saw.
+        """
+        summary = {"traced_queries": len(self.records)}
+        for component in self.COMPONENTS:
+            values = sorted(record[component] for record in self.records)
+            summary[f"{component}_mean_ms"] = statistics.fmean(values) if values else None
+            summary[f"{component}_p50_ms"] = percentile(values, 50)
+            summary[f"{component}_p99_ms"] = percentile(values, 99)
+
+        summary["server_mean_ms"] = server_ms
+        execute_mean = summary["execute_mean_ms"]
+        summary["unattributed_mean_ms"] = execute_mean - server_ms if server_ms is not None and execute_mean is not None else None
+        return summary
+
+    def save(self, path):
+        """Write the per-query trace records."""
+        if not self.records:
+            return
+        with open(path, mode="w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(self.records[0].keys()))
+            writer.writeheader()
+            writer.writerows(sorted(self.records, key=lambda record: record["query_index"]))
+
+
+def percentile(sorted_values, p):
+    """Linearly interpolated percentile of an already sorted list, as in BenchmarkRunner's latency stats."""
+    if not sorted_values:
+        return None
+    idx = (len(sorted_values) - 1) * (p / 100)
+    lower = int(idx)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = idx - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def append_breakdown(path, row):
+    """Append one run's breakdown to the breakdown table, writing the header for a new file."""
+    file_exists = os.path.isfile(path)
+    with open(path, mode="a", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(row.keys()))
+        if not file_exists:
+            writer.writeheader()
+        writer.writerow(row)
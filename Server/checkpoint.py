@@ -0,0 +1,66 @@
+import hashlib
+import json
+
+
+class GenerationCheckpoint:
+    """
+    Tracks data generation progress in a table inside the target database.
+    Updates are written on the caller's cursor without committing, so each one lands in the same
+    transaction as the batch, copy or index it describes and can never run ahead of the data.
+    """
+
+    TABLE = "generator_checkpoint"
+
+    def __init__(self, cursor, generator_config):
+        self.cursor = cursor
+        self.fingerprint = self.compute_fingerprint(generator_config)
+
+    @staticmethod
+    def compute_fingerprint(generator_config):
+        """Hash the settings that determine the generated data; operational flags are left out."""
+        ignored = {"recreate_tables", "resume", "maintenance_work_mem", "session_settings", "copy_data", "index_monitor"}
+        relevant = {key: value for key, value in generator_config.items() if key not in ignored}
+        return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+
+    def create(self):
+        """Create the checkpoint table if it does not exist."""
+        self.cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.TABLE} (
+                phase TEXT PRIMARY KEY,
+                progress BIGINT NOT NULL DEFAULT 0,
+                done BOOLEAN NOT NULL DEFAULT FALSE,
+                fingerprint TEXT NOT NULL,
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+            );
+        """)
+
+    def matches(self):
+        """Whether the stored checkpoint was written for the same generator configuration."""
+        self.create()
+        self.cursor.execute(f"SELECT fingerprint FROM {self.TABLE} WHERE phase = 'config';")
+        row = self.cursor.fetchone()
+        return row is not None and row[0] == self.fingerprint
+
+    def reset(self):
+        """Discard all progress and start a checkpoint for the current configuration."""
+        self.create()
+        self.cursor.execute(f"DELETE FROM {self.TABLE};")
+        self.mark("config", done=True)
+
+    def mark(self, phase, progress=0, done=False):
+        """Record progress for a phase. The caller commits."""
+        self.cursor.execute(f"""
+            INSERT INTO {self.TABLE} (phase, progress, done, fingerprint)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (phase) DO UPDATE
+            SET progress = EXCLUDED.progress, done = EXCLUDED.done, updated_at = now();
+        """, (phase, progress, done, self.fingerprint))
+
+    def get(self, phase):
+        """Return (progress, done) for a phase, or (0, False) if it has not started."""
+        self.cursor.execute(f"SELECT progress, done FROM {self.TABLE} WHERE phase = %s;", (phase,))
+        row = self.cursor.fetchone()
+        return (row[0], row[1]) if row else (0, False)
+
+    def is_done(self, phase):
+        return self.get(phase)[1]
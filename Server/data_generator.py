@@ -1,21 +1,38 @@
 import psycopg2
-import random
 import time
 from tqdm import tqdm
 import logging
 import signal
 import sys
 import os
+import io
+import csv
 from threading import Event
+from embedding_generator import EmbeddingGenerator, TextGenerator, generate_tenants, to_copy_buffer
+from dataset_loader import DatasetLoader, format_size
+from checkpoint import GenerationCheckpoint
+from index_monitor import IndexBuildMonitor
 
 class DataGenerator:
+    QUERY_PROBE_TABLE = "generator_query_probe"
+
     def __init__(self, config):
         self.generator_config = config["generator"]
         self.db_config = config["db"]
         self.stop_event = Event()
         self.conn = None
         self.cursor = None
+        self.ground_truth_table = None
+        self.checkpoint = None
+        self.index_profiles = []
         self.setup_logger()
+        self.setup_source()
+        self.setup_partitioning()
+
+        self.text_config = self.generator_config.get("text", {})
+        self.texts = None
+        if self.text_config.get("enabled", False):
+            self.texts = TextGenerator(self.generator_config["seed"], self.text_config)
 
     def setup_logger(self):
         """Set up structured logging."""
@@ -39,6 +56,57 @@ class DataGenerator:
             ]
         )
 
+    def setup_source(self):
+        """Select the embedding source: an external dataset if configured, otherwise the synthetic generator."""
+        dataset_config = self.generator_config.get("dataset")
+        if not dataset_config:
+            self.embeddings = EmbeddingGenerator(
+                self.generator_config["dimensions"],
+                self.generator_config["seed"],
+                self.generator_config.get("distribution")
+            )
+            return
+
+        self.embeddings = DatasetLoader(dataset_config)
+        dimensions = self.embeddings.dimensions
+        size = format_size(self.embeddings.num_rows)
+
+        # Table names follow items_<index>_<dim>_<size>, derived from the dataset instead of the config.
+        self.generator_config["dimensions"] = dimensions
+        self.generator_config["num_rows"] = self.embeddings.num_rows
+        self.generator_config["tables"] = {
+            f"items_{index_type or 'no_index'}_{dimensions}_{size}": index_type
+            for index_type in dict.fromkeys(self.generator_config["tables"].values())
+        }
+        self.ground_truth_table = f"ground_truth_{dimensions}_{size}"
+        logging.info(f"Dataset tables: {', '.join(self.generator_config['tables'])}.")
+
+    def setup_partitioning(self):
+        """
+        Add a partitioned variant of every indexed table, so it can be compared against the monolithic one.
+        Variants are named <table>_<method><partitions>, e.g. items_hnsw_128_5M_hash8.
+        """
+        self.partitioning = self.generator_config.get("partitioning", {})
+        self.partitioned_tables = set()
+        if not self.partitioning.get("enabled", False):
+            return
+
+        method = self.partitioning.get("method", "hash")
+        partitions = self.partitioning.get("partitions", 8)
+        if method not in ("hash", "list"):
+            raise ValueError(f"Unknown partitioning method: {method}")
+        if self.partitioning.get("tenants", partitions) < partitions:
+            raise ValueError("Partitioning needs at least as many tenants as partitions.")
+
+        tables = dict(self.generator_config["tables"])
+        for table_name, index_type in self.generator_config["tables"].items():
+            if index_type:
+                partitioned_name = f"{table_name}_{method}{partitions}"
+                tables[partitioned_name] = index_type
+                self.partitioned_tables.add(partitioned_name)
+        self.generator_config["tables"] = tables
+        logging.info(f"Partitioned tables: {', '.join(sorted(self.partitioned_tables))}.")
+
     def connect_to_db(self):
         """Establish a connection to the database using the configuration."""
         try:
@@ -60,21 +128,30 @@ class DataGenerator:
             sys.exit(1)
 
     def configure_session(self):
-        """Configure database session settings."""
+        """
+        Configure database session settings. `session_settings` in the generator config replaces the defaults;
+        an empty block leaves every setting to the server's postgresql.conf.
+        """
         try:
-            maintenance_work_mem = self.generator_config["maintenance_work_mem"]
-            # self.cursor.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}';")
-            self.cursor.execute("SET maintenance_work_mem = '4GB';")
-            self.cursor.execute("SET work_mem = '128MB';")
-            # self.cursor.execute("SET shared_buffers = '8GB';")
-            self.cursor.execute("SET effective_cache_size = '24GB';")
-            self.cursor.execute("SET max_parallel_workers_per_gather = 6;")
-            self.cursor.execute("SET parallel_tuple_cost = 0.1;")
-            self.cursor.execute("SET parallel_setup_cost = 50;")
-            self.cursor.execute("SET force_parallel_mode = 'off';")
+            default_settings = {
+                "maintenance_work_mem": self.generator_config.get("maintenance_work_mem", "4GB"),
+                "work_mem": "128MB",
+                "effective_cache_size": "24GB",
+                "max_parallel_workers_per_gather": 6,
+                "parallel_tuple_cost": 0.1,
+                "parallel_setup_cost": 50,
+            }
+            settings = self.generator_config.get("session_settings", default_settings)
+            for name, value in settings.items():
+                self.cursor.execute(f"SET {name} = %s;", (str(value),))
+            # force_parallel_mode was renamed to debug_parallel_query in PostgreSQL 16.
+            self.cursor.execute("SHOW server_version_num;")
+            parallel_mode = "force_parallel_mode" if int(self.cursor.fetchone()[0]) < 160000 else "debug_parallel_query"
+            self.cursor.execute(f"SET {parallel_mode} = 'off';")
             logging.info("PostgreSQL settings optimized for index building and benchmarking.")
 
-            logging.info(f"Set maintenance_work_mem to {maintenance_work_mem}.")
+            self.cursor.execute("SHOW maintenance_work_mem;")
+            logging.info(f"maintenance_work_mem is {self.cursor.fetchone()[0]}.")
         except KeyError as e:
             logging.error(f"Missing configuration for: {e}")
             sys.exit(1)
@@ -88,78 +165,336 @@ class DataGenerator:
         logging.info("Recreating tables...")
         for table_name, index_type in self.generator_config["tables"].items():
             self.cursor.execute(f"DROP TABLE IF EXISTS {table_name};")
+            text_columns = ""
+            if self.texts:
+                language = self.text_config.get("language", "simple")
+                text_columns = f""",
+                    content TEXT,
+                    content_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('{language}', content)) STORED"""
+
+            if table_name in self.partitioned_tables:
+                # The partition key has to be part of the primary key.
+                self.cursor.execute(f"""
+                    CREATE TABLE {table_name} (
+                        id SERIAL,
+                        tenant_id INT NOT NULL,
+                        embedding VECTOR({self.generator_config['dimensions']}){text_columns},
+                        PRIMARY KEY (id, tenant_id)
+                    ) PARTITION BY {self.partitioning.get('method', 'hash').upper()} (tenant_id);
+                """)
+                self.create_partitions(table_name)
+            else:
+                tenant_column = "tenant_id INT NOT NULL," if self.partitioned_tables else ""
+                self.cursor.execute(f"""
+                    CREATE TABLE {table_name} (
+                        id SERIAL PRIMARY KEY,
+                        {tenant_column}
+                        embedding VECTOR({self.generator_config['dimensions']}){text_columns}
+                    );
+                """)
+            logging.info(f"Table {table_name} recreated successfully.")
+
+        if self.ground_truth_table:
+            self.cursor.execute(f"DROP TABLE IF EXISTS {self.ground_truth_table};")
             self.cursor.execute(f"""
-                CREATE TABLE {table_name} (
-                    id SERIAL PRIMARY KEY,
-                    embedding VECTOR({self.generator_config['dimensions']})
+                CREATE TABLE {self.ground_truth_table} (
+                    id INT PRIMARY KEY,
+                    query VECTOR({self.generator_config['dimensions']}),
+                    neighbors INT[]
                 );
             """)
-            logging.info(f"Table {table_name} recreated successfully.")
+            logging.info(f"Table {self.ground_truth_table} recreated successfully.")
+
+    def check_tables_empty(self):
+        """
+        Refuse to load into tables that already hold rows without a matching checkpoint.
+        Rows are written with explicit ids from 1, so they would collide with the existing ones.
+        """
+        tables = list(self.generator_config["tables"])
+        if self.ground_truth_table:
+            tables.append(self.ground_truth_table)
+        for table_name in tables:
+            self.cursor.execute("SELECT to_regclass(%s);", (table_name,))
+            if self.cursor.fetchone()[0] is None:
+                continue
+            self.cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {table_name});")
+            if self.cursor.fetchone()[0]:
+                raise ValueError(
+                    f"Table {table_name} already holds rows and no checkpoint matches this configuration; "
+                    f"set recreate_tables to reload it, or resume to continue a run with the same configuration."
+                )
+
+    def create_partitions(self, table_name):
+        """Create the partitions of a partitioned table; each gets its own, smaller indexes."""
+        partitions = self.partitioning.get("partitions", 8)
+        tenants = self.partitioning.get("tenants", partitions)
+
+        for i in range(partitions):
+            if self.partitioning.get("method", "hash") == "hash":
+                bounds = f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {i})"
+            else:
+                bounds = f"FOR VALUES IN ({', '.join(str(t) for t in range(i, tenants, partitions))})"
+            self.cursor.execute(f"CREATE TABLE {table_name}_p{i} PARTITION OF {table_name} {bounds};")
+
+    def data_columns(self):
+        """Columns written when loading and copying data."""
+        columns = ["id"]
+        if self.partitioned_tables:
+            columns.append("tenant_id")
+        columns.append("embedding")
+        if self.texts:
+            columns.append("content")
+        return ", ".join(columns)
 
     def populate_table(self, table_name):
-        """Populate the no_index table with random embeddings."""
+        """Populate the no_index table with generated embeddings, streamed in chunks via COPY."""
         num_rows = self.generator_config["num_rows"]
         batch_size = self.generator_config["batch_size"]
-        dimensions = self.generator_config["dimensions"]
+        phase = f"populate:{table_name}"
 
-        logging.info(f"Populating table {table_name} with {num_rows} embeddings...")
+        rows_loaded, done = self.checkpoint.get(phase)
+        if done:
+            logging.info(f"Table {table_name} already populated, skipping.")
+            return True
 
-        total_batches = (num_rows + batch_size - 1) // batch_size
-        with tqdm(total=num_rows, desc=f"Populating {table_name}", unit="rows") as pbar:
-            batch = []
-            for i in range(num_rows):
+        if rows_loaded:
+            logging.info(f"Resuming population of {table_name} from row {rows_loaded}.")
+        logging.info(f"Populating table {table_name} with {num_rows} {self.embeddings.type} embeddings...")
+
+        # Every committed batch is a whole chunk, and chunks are seeded independently,
+        # so resuming at the next chunk reproduces exactly the data an uninterrupted run would.
+        start_chunk = rows_loaded // batch_size
+        with tqdm(total=num_rows, initial=rows_loaded, desc=f"Populating {table_name}", unit="rows") as pbar:
+            for chunk_index, embeddings in self.embeddings.generate_chunks(num_rows, batch_size, start_chunk):
                 if self.stop_event.is_set():
-                    logging.warning("Data generation interrupted.")
-                    break
-
-                embedding = [round(random.uniform(0, 1), 2) for _ in range(dimensions)]
-                batch.append((embedding,))
-
-                if len(batch) == batch_size:
-                    self.cursor.executemany(
-                        f"INSERT INTO {table_name} (embedding) VALUES (%s)", batch
-                    )
-                    self.conn.commit()
-                    pbar.update(len(batch))
-                    batch = []
-
-            if batch:
-                self.cursor.executemany(
-                    f"INSERT INTO {table_name} (embedding) VALUES (%s)", batch
+                    logging.warning(f"Data generation interrupted at row {rows_loaded}; rerun to resume.")
+                    return False
+
+                # Ids are explicit (row number + 1) so they match the ground truth neighbour ids.
+                texts = self.texts.generate_chunk(chunk_index, len(embeddings)) if self.texts else None
+                tenants = None
+                if self.partitioned_tables:
+                    num_tenants = self.partitioning.get("tenants", self.partitioning.get("partitions", 8))
+                    tenants = generate_tenants(self.generator_config["seed"], chunk_index, len(embeddings), num_tenants)
+                self.cursor.copy_expert(
+                    f"COPY {table_name} ({self.data_columns()}) FROM STDIN",
+                    to_copy_buffer(embeddings, chunk_index * batch_size + 1, texts, tenants)
                 )
+                rows_loaded = chunk_index * batch_size + len(embeddings)
+                self.checkpoint.mark(phase, rows_loaded)
                 self.conn.commit()
-                pbar.update(len(batch))
+                pbar.update(len(embeddings))
+
+        self.cursor.execute(f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), {num_rows});")
+        self.checkpoint.mark(phase, num_rows, done=True)
+        self.conn.commit()
         logging.info(f"Table {table_name} populated successfully.")
+        return True
 
     def copy_data_to_other_tables(self, source_table):
         """Copy data from source table to other tables."""
         for target_table, index_type in self.generator_config["tables"].items():
             if target_table != source_table:
+                phase = f"copy:{target_table}"
+                if self.checkpoint.is_done(phase):
+                    logging.info(f"Data already copied to {target_table}, skipping.")
+                    continue
+                if self.stop_event.is_set():
+                    logging.warning("Data generation interrupted before copying; rerun to resume.")
+                    return False
+
                 logging.info(f"Copying data from {source_table} to {target_table}...")
-                self.cursor.execute(f"INSERT INTO {target_table} (embedding) SELECT embedding FROM {source_table};")
+                columns = self.data_columns()
+                self.cursor.execute(f"INSERT INTO {target_table} ({columns}) SELECT {columns} FROM {source_table};")
+                self.checkpoint.mark(phase, done=True)
                 self.conn.commit()
                 logging.info(f"Data copied to {target_table}.")
+        return True
+
+    def save_query_probe(self):
+        """Store the first generated queries, which the client compares against its own to detect a diverged mixture."""
+        self.cursor.execute(f"DROP TABLE IF EXISTS {self.QUERY_PROBE_TABLE};")
+        if isinstance(self.embeddings, EmbeddingGenerator):
+            self.cursor.execute(f"CREATE TABLE {self.QUERY_PROBE_TABLE} (id INT PRIMARY KEY, query REAL[]);")
+            self.cursor.executemany(
+                f"INSERT INTO {self.QUERY_PROBE_TABLE} (id, query) VALUES (%s, %s);",
+                [(i, query.tolist()) for i, query in enumerate(self.embeddings.query_probe())]
+            )
+        self.conn.commit()
+
+    def import_ground_truth(self):
+        """Import the dataset's bundled query vectors and nearest neighbour ids."""
+        if not self.ground_truth_table or self.checkpoint.is_done("ground_truth"):
+            return
+
+        ground_truth = self.embeddings.load_ground_truth()
+        if ground_truth is None:
+            logging.info("Dataset has no bundled ground truth.")
+            return
+
+        queries, neighbors = ground_truth
+        logging.info(f"Importing {len(queries)} ground truth queries into {self.ground_truth_table}...")
+
+        rows = []
+        for i, (query, neighbor_ids) in enumerate(zip(queries, neighbors)):
+            query_str = "[" + ",".join(f"{x:.9g}" for x in query) + "]"
+            # Neighbours are 0-based row indices; table ids are 1-based.
+            neighbors_str = "{" + ",".join(str(n + 1) for n in neighbor_ids if n >= 0) + "}"
+            rows.append(f"{i}\t{query_str}\t{neighbors_str}\n")
+
+        self.cursor.copy_expert(
+            f"COPY {self.ground_truth_table} (id, query, neighbors) FROM STDIN", io.StringIO("".join(rows))
+        )
+        self.checkpoint.mark("ground_truth", len(rows), done=True)
+        self.conn.commit()
+        logging.info(f"Ground truth imported into {self.ground_truth_table}.")
 
     def create_indexes(self):
-        """Create indexes for the indexed tables."""
+        """Create indexes for the indexed tables, and full-text indexes when text is enabled."""
         for table_name, index_type in self.generator_config["tables"].items():
             if index_type:
-                index_creation_start = time.time()
-
-                logging.info(f"Creating {index_type} index on {table_name}...")
                 index_config = self.generator_config["index_configs"][index_type]
-                self.cursor.execute(f"""
+                built = self.build_index(
+                    table_name,
+                    index_type,
+                    f"{table_name}_{index_type}_idx",
+                    f"index:{table_name}",
+                    f"""
                     CREATE INDEX {table_name}_{index_type}_idx 
                     ON {table_name} USING {index_type} (embedding vector_l2_ops) 
                     {index_config};
-                """)
-                self.conn.commit()
+                    """,
+                    index_config.lower().replace("(", "").replace(")", "").replace(",", " and").replace(" = ", "=")
+                )
+                if not built:
+                    return False
+
+        if self.texts:
+            for table_name in self.generator_config["tables"]:
+                built = self.build_index(
+                    table_name,
+                    "gin",
+                    f"{table_name}_content_gin_idx",
+                    f"gin:{table_name}",
+                    f"CREATE INDEX {table_name}_content_gin_idx ON {table_name} USING gin (content_tsv);",
+                    "full-text"
+                )
+                if not built:
+                    return False
+        return True
+
+    def build_index(self, table_name, index_type, index_name, phase, create_statement, log_config):
+        """
+        Build one index under the monitor and checkpoint it. Returns False if interrupted.
+        On a partitioned table, PostgreSQL builds one index per partition.
+        """
+        if self.checkpoint.is_done(phase):
+            logging.info(f"{index_type} index on {table_name} already built, skipping.")
+            return True
+        if self.stop_event.is_set():
+            logging.warning("Data generation interrupted before index creation; rerun to resume.")
+            return False
+
+        index_creation_start = time.time()
+
+        logging.info(f"Creating {index_type} index on {table_name}...")
+
+        monitor = self.start_index_monitor(table_name, index_type)
+        del self.conn.notices[:]
+        try:
+            self.cursor.execute(create_statement)
+        finally:
+            if monitor:
+                monitor.stop()
+        self.checkpoint.mark(phase, done=True)
+        self.conn.commit()
+
+        index_creation_time = round(time.time() - index_creation_start, 2)
+
+        if monitor:
+            self.save_index_profile(monitor, index_name)
+        else:
+            self.index_profiles.append({
+                "table_name": table_name,
+                "index_type": index_type,
+                "partitioned": table_name in self.partitioned_tables,
+                "total_seconds": index_creation_time,
+                "peak_rss_kb": None,
+                "index_size_bytes": self.index_size(index_name),
+            })
+
+        logging.info(f"{index_type} {log_config} index created for {table_name} in {index_creation_time} seconds or {index_creation_time/60:.2f} minutes.")
+        return True
+
+    def start_index_monitor(self, table_name, index_type):
+        """Start following an index build from a second connection, unless disabled in the config."""
+        monitor_config = self.generator_config.get("index_monitor", {})
+        if not monitor_config.get("enabled", True):
+            return None
+
+        monitor = IndexBuildMonitor(
+            self.db_config,
+            self.conn.get_backend_pid(),
+            table_name,
+            index_type,
+            poll_interval=monitor_config.get("poll_interval", 1.0),
+            save_samples=monitor_config.get("save_samples", True)
+        )
+        monitor.start()
+        return monitor
 
-                log_config = index_config.lower().replace("(", "").replace(")", "").replace(",", " and").replace(" = ", "=")
+    def index_size(self, index_name):
+        """On-disk size of an index, summed over its partitions. pg_partition_tree is empty for a plain index."""
+        self.cursor.execute(f"""
+            SELECT COALESCE(
+                (SELECT SUM(pg_relation_size(relid)) FROM pg_partition_tree('{index_name}')),
+                pg_relation_size('{index_name}')
+            )::bigint;
+        """)
+        return self.cursor.fetchone()[0]
 
-                index_creation_time = round(time.time() - index_creation_start, 2)
-                
-                logging.info(f"{index_type} {log_config} index created for {table_name} in {index_creation_time} seconds or {index_creation_time/60:.2f} minutes.")
+    def save_index_profile(self, monitor, index_name):
+        """Save the build profile and warn about memory pressure seen during the build."""
+        monitor.extra["index_size_bytes"] = self.index_size(index_name)
+        monitor.extra["partitioned"] = monitor.table_name in self.partitioned_tables
+        profile = monitor.save_profile(os.path.join("logs", "index_profiles"), self.conn.notices)
+        self.index_profiles.append({
+            key: profile[key]
+            for key in ("table_name", "index_type", "partitioned", "total_seconds", "peak_rss_kb", "index_size_bytes")
+        })
+
+        for phase in profile["phases"]:
+            logging.info(f"{monitor.table_name}: {phase['phase']} took {phase['duration']}s.")
+        for notice in profile["notices"]:
+            logging.warning(f"{monitor.table_name}: {notice}")
+        if profile["swap_out_pages"]:
+            logging.warning(
+                f"{profile['swap_out_pages']} pages were swapped out while building the index on {monitor.table_name}; "
+                f"maintenance_work_mem may be too large for this host."
+            )
+
+    def save_index_summary(self):
+        """Write one row per index built in this run, to compare partitioned and monolithic layouts."""
+        if not self.index_profiles:
+            return
+
+        folder = os.path.join("logs", "index_profiles")
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        path = os.path.join(folder, f"summary_{time.strftime('%Y%m%d-%H%M%S')}.csv")
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(self.index_profiles[0].keys()))
+            writer.writeheader()
+            writer.writerows(self.index_profiles)
+
+        for row in self.index_profiles:
+            size_mb = row["index_size_bytes"] / 1024 ** 2 if row["index_size_bytes"] is not None else float("nan")
+            logging.info(
+                f"{row['index_type']} on {row['table_name']}: {row['total_seconds']}s, "
+                f"{size_mb:.1f} MB, peak RSS {row['peak_rss_kb']} kB."
+            )
+        logging.info(f"Index build summary saved to {path}.")
 
     def shutdown(self):
         """Close database connections and clean up resources."""
@@ -170,15 +505,22 @@ class DataGenerator:
         logging.info("Database connection closed.")
 
     def start(self):
-        """Run the data generation process."""
+        """Run the data generation process. Returns True when every phase completed."""
         try:
-            random.seed(self.generator_config["seed"])
-    
             self.connect_to_db()
             self.configure_session()
 
-            if self.generator_config["recreate_tables"]:
-                self.recreate_tables()
+            self.checkpoint = GenerationCheckpoint(self.cursor, self.generator_config)
+            if self.generator_config.get("resume", False) and self.checkpoint.matches():
+                logging.info("Found a checkpoint for this configuration, resuming.")
+            else:
+                if self.generator_config["recreate_tables"]:
+                    self.recreate_tables()
+                else:
+                    self.check_tables_empty()
+                self.checkpoint.reset()
+                self.conn.commit()
+            self.save_query_probe()
 
             no_index_name = None
             for table_name, indexing in self.generator_config["tables"].items():
@@ -187,12 +529,19 @@ class DataGenerator:
             if not no_index_name:
                 raise Exception("Table to be copied cannot be found.")            
 
-            self.populate_table(no_index_name)
-            self.copy_data_to_other_tables(no_index_name)
-            self.create_indexes()
+            if not self.populate_table(no_index_name):
+                return False
+            self.import_ground_truth()
+            if not self.copy_data_to_other_tables(no_index_name):
+                return False
+            if not self.create_indexes():
+                return False
+            self.save_index_summary()
 
             logging.info("Data generation completed successfully.")
+            return True
         except Exception as e:
             logging.error(f"An error occurred during data generation: {e}")
+            return False
         finally:
             self.shutdown()
@@ -0,0 +1,143 @@
+import os
+import logging
+import numpy as np
+
+try:
+    import h5py
+except ImportError:
+    h5py = None
+
+
+def read_vecs(path, dtype):
+    """Memory-map a .fvecs/.ivecs/.bvecs file: each record is an int32 dimension followed by the vector."""
+    header = np.fromfile(path, dtype=np.int32, count=1)
+    if header.size == 0:
+        raise ValueError(f"Empty vector file: {path}")
+    dimensions = int(header[0])
+
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    record_size = 4 + dimensions * np.dtype(dtype).itemsize
+    if raw.size % record_size:
+        raise ValueError(f"{path} is not a valid vecs file for dimension {dimensions}.")
+
+    # Strip the per-record dimension prefix without copying.
+    records = raw.reshape(-1, record_size)[:, 4:]
+    return records.view(dtype)
+
+
+def detect_format(path):
+    """Infer the dataset format from the file extension."""
+    extension = os.path.splitext(path)[1].lower()
+    formats = {
+        ".fvecs": "fvecs",
+        ".bvecs": "bvecs",
+        ".ivecs": "ivecs",
+        ".hdf5": "hdf5",
+        ".h5": "hdf5",
+        ".npy": "npy",
+    }
+    if extension not in formats:
+        raise ValueError(f"Cannot infer dataset format from extension: {path}")
+    return formats[extension]
+
+
+def open_array(path, key=None):
+    """Open a 2-D vector array lazily; nothing is read until it is sliced."""
+    file_format = detect_format(path)
+
+    if file_format == "fvecs":
+        return read_vecs(path, np.float32)
+    if file_format == "bvecs":
+        return read_vecs(path, np.uint8)
+    if file_format == "ivecs":
+        return read_vecs(path, np.int32)
+    if file_format == "npy":
+        return np.load(path, mmap_mode="r")
+
+    if h5py is None:
+        raise ImportError("h5py is required to load HDF5 datasets.")
+    return h5py.File(path, "r")[key]
+
+
+class DatasetLoader:
+    """Streams an external embedding dataset in chunks, with the same interface as EmbeddingGenerator."""
+
+    type = "dataset"
+
+    def __init__(self, dataset_config):
+        self.config = dataset_config
+        self.path = dataset_config["path"]
+        self.vectors = open_array(self.path, dataset_config.get("train_key", "train"))
+
+        total_rows, self.dimensions = self.vectors.shape
+        limit = dataset_config.get("num_rows")
+        self.num_rows = min(limit, total_rows) if limit else total_rows
+        self.truncated = self.num_rows < total_rows
+        self.distance = self.read_distance()
+
+        logging.info(
+            f"Opened dataset {self.path}: {total_rows} x {self.dimensions}, {self.distance} distance, "
+            f"loading {self.num_rows} rows."
+        )
+
+    def read_distance(self):
+        """
+        The dataset's distance metric: the HDF5 `distance` attribute, or `distance` in the config (default euclidean).
+        Tables are indexed and queried with L2 distance. Angular datasets are normalized to unit length on load,
+        where the L2 order is the cosine order, so their ground truth still applies. Other metrics are rejected.
+        """
+        distance = self.config.get("distance")
+        if distance is None and detect_format(self.path) == "hdf5":
+            distance = self.vectors.file.attrs.get("distance")
+            if isinstance(distance, bytes):
+                distance = distance.decode()
+        distance = distance or "euclidean"
+
+        if distance not in ("euclidean", "angular"):
+            raise ValueError(f"Unsupported dataset distance '{distance}'; only euclidean and angular datasets can be loaded.")
+        return distance
+
+    def prepare(self, vectors):
+        """Convert vectors to float32, normalized to unit length for angular datasets."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.distance == "angular":
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors
+
+    def generate_chunks(self, num_rows, chunk_size, start_chunk=0):
+        """Yield (chunk_index, embeddings) pairs read from the dataset."""
+        num_rows = min(num_rows, self.num_rows)
+        total_chunks = (num_rows + chunk_size - 1) // chunk_size
+        for index in range(start_chunk, total_chunks):
+            start = index * chunk_size
+            end = min(start + chunk_size, num_rows)
+            yield index, self.prepare(self.vectors[start:end])
+
+    def load_ground_truth(self):
+        """
+        Return (queries, neighbors) bundled with the dataset, or None if there are none.
+        Neighbors are 0-based row indices into the dataset.
+        """
+        if self.truncated:
+            logging.warning("Dataset is truncated by num_rows; bundled ground truth no longer applies and is skipped.")
+            return None
+
+        if detect_format(self.path) == "hdf5":
+            queries = open_array(self.path, self.config.get("query_key", "test"))
+            neighbors = open_array(self.path, self.config.get("neighbors_key", "neighbors"))
+        elif "queries_path" in self.config and "ground_truth_path" in self.config:
+            queries = open_array(self.config["queries_path"])
+            neighbors = open_array(self.config["ground_truth_path"])
+        else:
+            return None
+
+        return self.prepare(queries), np.asarray(neighbors, dtype=np.int64)
+
+
+def format_size(num_rows):
+    """Format a row count the way table names do: 500000 -> 500K, 5000000 -> 5M."""
+    if num_rows % 1_000_000 == 0:
+        return f"{num_rows // 1_000_000}M"
+    if num_rows % 1_000 == 0:
+        return f"{num_rows // 1_000}K"
+    return str(num_rows)
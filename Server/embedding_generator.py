@@ -0,0 +1,124 @@
+import io
+import numpy as np
+
+
+class EmbeddingGenerator:
+    """Generates synthetic embeddings in deterministic, independently seeded chunks."""
+
+    def __init__(self, dimensions, seed, distribution=None):
+        self.dimensions = dimensions
+        self.seed = seed
+        self.distribution = distribution or {"type": "uniform"}
+        self.type = self.distribution.get("type", "uniform")
+
+        if self.type == "clustered":
+            self.build_mixture()
+        elif self.type != "uniform":
+            raise ValueError(f"Unknown distribution type: {self.type}")
+
+    def build_mixture(self):
+        """Build the Gaussian mixture: cluster weights, centers, per-axis scales and projection basis."""
+        num_clusters = self.distribution.get("num_clusters", 100)
+        intrinsic_dim = min(self.distribution.get("intrinsic_dim", self.dimensions), self.dimensions)
+        center_spread = self.distribution.get("center_spread", 1.0)
+        cluster_std = self.distribution.get("cluster_std", 0.1)
+        anisotropy = self.distribution.get("anisotropy", 0.5)
+
+        # Model parameters live on their own seed stream so data and queries can rebuild them.
+        rng = np.random.default_rng([self.seed, 0])
+
+        # Unequal cluster sizes, as in real corpora.
+        self.weights = rng.dirichlet(np.ones(num_clusters))
+        self.centers = rng.normal(0.0, center_spread, (num_clusters, intrinsic_dim))
+        # Each cluster gets its own per-axis spread, so clusters are elongated rather than spherical.
+        self.scales = cluster_std * rng.lognormal(0.0, anisotropy, (num_clusters, intrinsic_dim))
+
+        # Orthonormal rows spanning the low-dimensional subspace the data lives in.
+        gaussian = rng.normal(size=(self.dimensions, intrinsic_dim))
+        q, _ = np.linalg.qr(gaussian)
+        self.basis = q.T.astype(np.float32)
+
+    def chunk_rng(self, stream, index):
+        """Return the generator for one chunk; chunks are reproducible independently of each other."""
+        return np.random.default_rng([self.seed, stream, index])
+
+    def sample(self, rng, count, extra_noise=0.0):
+        """Draw `count` vectors from the configured distribution."""
+        if self.type == "uniform":
+            return np.round(rng.uniform(0, 1, (count, self.dimensions)), 2).astype(np.float32)
+
+        labels = rng.choice(len(self.weights), size=count, p=self.weights)
+        latent = self.centers[labels] + rng.normal(size=(count, self.centers.shape[1])) * self.scales[labels]
+        vectors = latent.astype(np.float32) @ self.basis
+
+        noise_std = self.distribution.get("noise_std", 0.0) + extra_noise
+        if noise_std > 0:
+            vectors += rng.normal(0.0, noise_std, vectors.shape).astype(np.float32)
+
+        if self.distribution.get("normalize", False):
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.maximum(norms, 1e-12)
+
+        return vectors
+
+    def generate_chunk(self, index, chunk_size):
+        """Generate data chunk number `index`."""
+        return self.sample(self.chunk_rng(1, index), chunk_size)
+
+    def generate_chunks(self, num_rows, chunk_size, start_chunk=0):
+        """Yield (chunk_index, embeddings) pairs covering `num_rows` rows, never holding more than one chunk."""
+        total_chunks = (num_rows + chunk_size - 1) // chunk_size
+        for index in range(start_chunk, total_chunks):
+            count = min(chunk_size, num_rows - index * chunk_size)
+            yield index, self.generate_chunk(index, count)
+
+    def query_probe(self, count=8):
+        """
+        The first `count` benchmark queries, as Client/query_generator.py draws them (stream 2, index 0).
+        Stored next to the data so the client can check that its copy of the mixture still matches this one.
+        """
+        return self.sample(self.chunk_rng(2, 0), count, self.distribution.get("query_noise", 0.0))
+
+
+class TextGenerator:
+    """Generates synthetic documents of Zipf-distributed words ('w0', 'w1', ...) for full-text search."""
+
+    def __init__(self, seed, text_config):
+        self.seed = seed
+        self.vocabulary_size = text_config.get("vocabulary_size", 10000)
+        self.words_per_row = text_config.get("words_per_row", 20)
+        ranks = np.arange(1, self.vocabulary_size + 1)
+        weights = 1.0 / ranks ** text_config.get("zipf_exponent", 1.1)
+        self.probabilities = weights / weights.sum()
+        self.words = np.array([f"w{i}" for i in range(self.vocabulary_size)])
+
+    def generate_chunk(self, index, chunk_size):
+        """Generate the documents for data chunk number `index`, on their own seed stream."""
+        rng = np.random.default_rng([self.seed, 3, index])
+        word_ids = rng.choice(self.vocabulary_size, size=(chunk_size, self.words_per_row), p=self.probabilities)
+        return [" ".join(row) for row in self.words[word_ids]]
+
+
+def generate_tenants(seed, index, count, num_tenants):
+    """Assign tenant ids uniformly to the rows of data chunk number `index`, on their own seed stream."""
+    return np.random.default_rng([seed, 5, index]).integers(0, num_tenants, count)
+
+
+def to_copy_buffer(embeddings, first_id, texts=None, tenants=None):
+    """
+    Render (id[, tenant_id], embedding[, content]) COPY text rows, with embeddings in pgvector's '[x,y,...]' literal format.
+    Texts must not contain tabs, newlines or backslashes.
+    """
+    ids = np.arange(first_id, first_id + len(embeddings))
+    columns = [ids] if tenants is None else [ids, tenants]
+    rows = np.column_stack(columns + [embeddings.astype(np.float64)])
+    # 9 significant digits round-trip float32 exactly, so external datasets are stored unchanged.
+    row_format = "%d\t" * len(columns) + "[" + ",".join(["%.9g"] * embeddings.shape[1]) + "]"
+
+    buffer = io.StringIO()
+    np.savetxt(buffer, rows, fmt=row_format)
+    if texts is not None:
+        lines = buffer.getvalue().splitlines()
+        buffer = io.StringIO("".join(f"{line}\t{text}\n" for line, text in zip(lines, texts)))
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,237 @@
+import psycopg2
+import time
+import json
+import logging
+import os
+import socket
+from threading import Thread, Event
+from tqdm import tqdm
+
+
+class IndexBuildMonitor:
+    """
+    Follows a CREATE INDEX from a second connection by polling pg_stat_progress_create_index,
+    drives a progress bar with the reported counters and records a per-phase timing profile.
+    When the builder backend runs on this host, its memory and IO and the host's swap activity are sampled too.
+    """
+
+    def __init__(self, db_config, builder_pid, table_name, index_type, poll_interval=1.0, save_samples=True):
+        self.db_config = db_config
+        self.builder_pid = builder_pid
+        self.table_name = table_name
+        self.index_type = index_type
+        self.poll_interval = poll_interval
+        self.save_samples = save_samples
+        self.stop_event = Event()
+        self.thread = None
+        self.pbar = None
+
+        self.phases = []
+        self.samples = []
+        self.extra = {}
+        # Host stats describe this machine, so they are only meaningful when the server runs on it.
+        self.local_host = is_local_host(db_config["host"])
+        self.local_process = self.local_host and self.is_local_builder()
+
+    def is_local_builder(self):
+        """
+        Whether the builder pid on this (local) host belongs to a postgres process,
+        not to an unrelated process that happens to share it.
+        """
+        try:
+            with open(f"/proc/{self.builder_pid}/comm") as file:
+                return file.read().strip() == "postgres"
+        except OSError:
+            return False
+
+    def start(self):
+        """Start polling in a background thread."""
+        self.start_time = time.monotonic()
+        self.start_host = self.read_host_stats()
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop polling and close the current phase."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        if self.pbar:
+            self.pbar.close()
+        self.end_time = time.monotonic()
+        self.end_host = self.read_host_stats()
+        if self.phases:
+            self.phases[-1]["end"] = round(self.end_time - self.start_time, 3)
+
+    def run(self):
+        """Poll until stopped. Monitoring problems are logged and never interrupt the build."""
+        try:
+            conn = psycopg2.connect(
+                host=self.db_config["host"],
+                port=self.db_config["port"],
+                dbname=self.db_config["dbname"],
+                user=self.db_config["user"],
+                password=self.db_config["password"]
+            )
+            conn.autocommit = True
+        except Exception as e:
+            logging.warning(f"Index build monitor could not connect, progress will not be reported: {e}")
+            return
+
+        try:
+            with conn.cursor() as cursor:
+                while not self.stop_event.wait(self.poll_interval):
+                    cursor.execute("""
+                        SELECT phase, blocks_total, blocks_done, tuples_total, tuples_done,
+                               partitions_total, partitions_done
+                        FROM pg_stat_progress_create_index
+                        WHERE pid = %s;
+                    """, (self.builder_pid,))
+                    row = cursor.fetchone()
+                    if row:
+                        self.record(*row)
+        except Exception as e:
+            logging.warning(f"Index build monitor stopped: {e}")
+        finally:
+            conn.close()
+
+    def record(self, phase, blocks_total, blocks_done, tuples_total, tuples_done, partitions_total, partitions_done):
+        """Record one progress sample, tracking phase transitions and updating the progress bar."""
+        elapsed = round(time.monotonic() - self.start_time, 3)
+
+        if not self.phases or self.phases[-1]["phase"] != phase:
+            if self.phases:
+                self.phases[-1]["end"] = elapsed
+                logging.info(f"{self.table_name}: phase '{self.phases[-1]['phase']}' took {elapsed - self.phases[-1]['start']:.1f}s.")
+            self.phases.append({"phase": phase, "start": elapsed, "end": None})
+            self.start_bar(phase)
+
+        # pgvector reports tuples for most phases; fall back to blocks for heap scans.
+        total, done = (tuples_total, tuples_done) if tuples_total else (blocks_total, blocks_done)
+        if partitions_total:
+            self.pbar.set_description(f"{self.table_name} [{phase}, partition {partitions_done + 1}/{partitions_total}]", refresh=False)
+        if total:
+            self.pbar.total = total
+            self.pbar.n = done
+            self.pbar.refresh()
+
+        sample = {
+            "elapsed": elapsed,
+            "phase": phase,
+            "blocks_total": blocks_total,
+            "blocks_done": blocks_done,
+            "tuples_total": tuples_total,
+            "tuples_done": tuples_done,
+            "partitions_total": partitions_total,
+            "partitions_done": partitions_done,
+        }
+        sample.update(self.read_process_stats())
+        sample.update(self.read_host_stats())
+        self.samples.append(sample)
+
+    def start_bar(self, phase):
+        """Start a fresh progress bar for a new build phase."""
+        if self.pbar:
+            self.pbar.close()
+        self.pbar = tqdm(total=0, desc=f"{self.table_name} [{phase}]", unit="tuples")
+
+    def read_process_stats(self):
+        """Resident memory and IO of the builder backend, when it runs on this host and is readable."""
+        if not self.local_process:
+            return {}
+
+        stats = {}
+        try:
+            with open(f"/proc/{self.builder_pid}/status") as file:
+                for line in file:
+                    if line.startswith("VmRSS:"):
+                        stats["rss_kb"] = int(line.split()[1])
+            with open(f"/proc/{self.builder_pid}/io") as file:
+                for line in file:
+                    key, value = line.split(":")
+                    if key in ("read_bytes", "write_bytes"):
+                        stats[key] = int(value)
+        except OSError:
+            pass
+        return stats
+
+    def read_host_stats(self):
+        """Available memory and cumulative swap traffic of this host, when the server runs on it."""
+        stats = {}
+        if not self.local_host:
+            return stats
+        try:
+            with open("/proc/meminfo") as file:
+                for line in file:
+                    key, value = line.split(":")
+                    if key in ("MemAvailable", "SwapFree"):
+                        stats[f"{key.lower()}_kb"] = int(value.split()[0])
+            with open("/proc/vmstat") as file:
+                for line in file:
+                    key, value = line.split()
+                    if key in ("pswpin", "pswpout"):
+                        stats[key] = int(value)
+        except OSError:
+            pass
+        return stats
+
+    def profile(self, notices=None):
+        """Summarize the build: total and per-phase durations, peak memory, IO and swap traffic."""
+        phases = [
+            {**phase, "duration": round(phase["end"] - phase["start"], 3) if phase["end"] is not None else None}
+            for phase in self.phases
+        ]
+        rss = [sample["rss_kb"] for sample in self.samples if "rss_kb" in sample]
+        io = [sample for sample in self.samples if "write_bytes" in sample]
+
+        profile = {
+            "table_name": self.table_name,
+            "index_type": self.index_type,
+            "builder_pid": self.builder_pid,
+            "total_seconds": round(self.end_time - self.start_time, 3),
+            "phases": phases,
+            "peak_rss_kb": max(rss) if rss else None,
+            "read_bytes": io[-1]["read_bytes"] - io[0]["read_bytes"] if io else None,
+            "write_bytes": io[-1]["write_bytes"] - io[0]["write_bytes"] if io else None,
+            "swap_in_pages": self.delta("pswpin"),
+            "swap_out_pages": self.delta("pswpout"),
+            "notices": [notice.strip() for notice in notices or []],
+            **self.extra,
+        }
+        if self.save_samples:
+            profile["samples"] = self.samples
+        return profile
+
+    def delta(self, key):
+        """Change of a cumulative host counter over the whole build."""
+        if key in self.start_host and key in self.end_host:
+            return self.end_host[key] - self.start_host[key]
+        return None
+
+    def save_profile(self, folder, notices=None):
+        """Write the build profile as JSON and return it."""
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        profile = self.profile(notices)
+        current_time = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(folder, f"{self.table_name}_{self.index_type}_{current_time}.json")
+        with open(path, "w") as file:
+            json.dump(profile, file, indent=2)
+
+        logging.info(f"Index build profile saved to {path}.")
+        return profile
+
+
+def is_local_host(host):
+    """Whether a connection host is this machine: a Unix socket directory, or an address of a local interface."""
+    if not host or host.startswith("/"):
+        return True
+    try:
+        address = socket.gethostbyname(host)
+        # Binding only succeeds for addresses that belong to this host.
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind((address, 0))
+        return True
+    except OSError:
+        return False
@@ -0,0 +1,261 @@
+import csv
+import logging
+import os
+import socket
+import time
+from threading import Thread, Event
+
+
+class ResourceSampler:
+    """
+    Samples host and PostgreSQL resource usage from /proc every `interval` seconds into a CSV file.
+    Every row is stamped with the wall-clock time, so it can be aligned with the client's runs afterwards.
+    - host: CPU split (user, system, iowait, steal), load, memory, swap, disk and network throughput
+    - postgres: the postmaster's process tree, with backend and parallel worker counts, CPU cores used, RSS and IO
+    Rates cover the interval that ends at the row's timestamp.
+    """
+
+    def __init__(self, interval=1.0, output_folder="logs/resources", process_name="postgres"):
+        self.interval = interval
+        self.output_folder = output_folder
+        self.process_name = process_name
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.disks = self.find_disks()
+        self.stop_event = Event()
+        self.thread = None
+        self.previous = None
+        self.output_path = None
+
+    def find_disks(self):
+        """Whole block devices, so partitions are not counted twice."""
+        try:
+            return {name for name in os.listdir("/sys/block") if not name.startswith(("loop", "ram", "zram"))}
+        except OSError:
+            return set()
+
+    def start(self):
+        """Start sampling in a background thread."""
+        if not os.path.exists(self.output_folder):
+            os.makedirs(self.output_folder)
+        current_time = time.strftime("%Y%m%d-%H%M%S")
+        self.output_path = os.path.join(self.output_folder, f"resources_{socket.gethostname()}_{current_time}.csv")
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+        logging.info(f"Sampling resources every {self.interval}s into {self.output_path}.")
+
+    def stop(self):
+        """Stop sampling and wait for the last row to be written."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join()
+        logging.info(f"Resource sampling stopped, samples saved to {self.output_path}.")
+
+    def run(self):
+        """Sample until stopped, appending and flushing one row per interval so the file can be read while running."""
+        self.previous = self.read_counters()
+        next_sample = time.monotonic() + self.interval
+        with open(self.output_path, mode="w", newline="") as file:
+            writer = None
+            while not self.stop_event.wait(max(0.0, next_sample - time.monotonic())):
+                next_sample += self.interval
+                try:
+                    row = self.sample()
+                except Exception as e:
+                    logging.warning(f"Resource sample failed: {e}")
+                    continue
+                if writer is None:
+                    writer = csv.DictWriter(file, fieldnames=list(row.keys()))
+                    writer.writeheader()
+                writer.writerow(row)
+                file.flush()
+
+    def sample(self):
+        """Read all counters and turn them into one row of rates and gauges since the previous sample."""
+        current = self.read_counters()
+        previous, self.previous = self.previous, current
+        elapsed = current["monotonic"] - previous["monotonic"]
+
+        def rate(key, scale=1.0):
+            return round((current[key] - previous[key]) * scale / elapsed, 3)
+
+        cpu_total = sum(current["cpu"].values()) - sum(previous["cpu"].values())
+
+        def cpu_pct(*fields):
+            used = sum(current["cpu"][field] - previous["cpu"][field] for field in fields)
+            return round(100.0 * used / cpu_total, 2) if cpu_total else 0.0
+
+        # Per-process IO is summed over processes alive in both samples, or new since the previous one.
+        pg_read = sum(io[0] - previous["pg_io"].get(pid, (0, 0))[0] for pid, io in current["pg_io"].items())
+        pg_write = sum(io[1] - previous["pg_io"].get(pid, (0, 0))[1] for pid, io in current["pg_io"].items())
+
+        return {
+            "timestamp": round(current["timestamp"], 3),
+            "interval": round(elapsed, 3),
+            "cpu_busy_pct": round(100.0 - cpu_pct("idle", "iowait"), 2),
+            "cpu_user_pct": cpu_pct("user", "nice"),
+            "cpu_system_pct": cpu_pct("system", "irq", "softirq"),
+            "cpu_iowait_pct": cpu_pct("iowait"),
+            "cpu_steal_pct": cpu_pct("steal"),
+            "load1": current["load1"],
+            "procs_running": current["procs_running"],
+            "procs_blocked": current["procs_blocked"],
+            "mem_available_mb": round(current["meminfo"].get("MemAvailable", 0) / 1024, 1),
+            "mem_cached_mb": round(current["meminfo"].get("Cached", 0) / 1024, 1),
+            "mem_dirty_mb": round(current["meminfo"].get("Dirty", 0) / 1024, 1),
+            "swap_in_per_s": rate("pswpin"),
+            "swap_out_per_s": rate("pswpout"),
+            "major_faults_per_s": rate("pgmajfault"),
+            "disk_read_mbps": rate("disk_read_sectors", 512 / 1e6),
+            "disk_write_mbps": rate("disk_write_sectors", 512 / 1e6),
+            "disk_read_iops": rate("disk_reads"),
+            "disk_write_iops": rate("disk_writes"),
+            # Share of the interval the busiest disk had IO in flight.
+            "disk_util_pct": round(max(
+                [(ticks - previous["disk_io_ticks"].get(name, ticks)) / (10 * elapsed) for name, ticks in current["disk_io_ticks"].items()],
+                default=0.0
+            ), 2),
+            "net_rx_mbps": rate("net_rx_bytes", 1 / 1e6),
+            "net_tx_mbps": rate("net_tx_bytes", 1 / 1e6),
+            "pg_processes": current["pg_processes"],
+            "pg_parallel_workers": current["pg_parallel_workers"],
+            "pg_running": current["pg_running"],
+            "pg_blocked": current["pg_blocked"],
+            "pg_cpu_cores": rate("pg_cpu_ticks", 1 / self.clock_ticks),
+            "pg_rss_mb": round(current["pg_rss_pages"] * self.page_size / 2**20, 1),
+            "pg_read_mbps": round(pg_read / 1e6 / elapsed, 3),
+            "pg_write_mbps": round(pg_write / 1e6 / elapsed, 3),
+        }
+
+    def read_counters(self):
+        """Snapshot of every cumulative counter and gauge the samples are computed from."""
+        counters = {"timestamp": time.time(), "monotonic": time.monotonic()}
+        counters.update(self.read_cpu())
+        counters.update(self.read_memory())
+        counters.update(self.read_disks())
+        counters.update(self.read_network())
+        counters.update(self.read_postgres())
+        with open("/proc/loadavg") as file:
+            counters["load1"] = float(file.read().split()[0])
+        return counters
+
+    def read_cpu(self):
+        """Host CPU time by state, and the running and blocked process counts."""
+        counters = {}
+        with open("/proc/stat") as file:
+            for line in file:
+                parts = line.split()
+                if parts[0] == "cpu":
+                    fields = ("user", "nice", "system", "idle", "iowait", "irq", "softirq", "steal")
+                    counters["cpu"] = {field: int(value) for field, value in zip(fields, parts[1:])}
+                elif parts[0] in ("procs_running", "procs_blocked"):
+                    counters[parts[0]] = int(parts[1])
+        return counters
+
+    def read_memory(self):
+        """Memory gauges in kB, and cumulative swap and major fault counters."""
+        meminfo = {}
+        with open("/proc/meminfo") as file:
+            for line in file:
+                key, value = line.split(":")
+                meminfo[key] = int(value.split()[0])
+
+        counters = {"meminfo": meminfo, "pswpin": 0, "pswpout": 0, "pgmajfault": 0}
+        with open("/proc/vmstat") as file:
+            for line in file:
+                key, value = line.split()
+                if key in counters:
+                    counters[key] = int(value)
+        return counters
+
+    def read_disks(self):
+        """Cumulative IO counters summed over whole disks, and IO ticks per disk."""
+        counters = {"disk_reads": 0, "disk_read_sectors": 0, "disk_writes": 0, "disk_write_sectors": 0, "disk_io_ticks": {}}
+        with open("/proc/diskstats") as file:
+            for line in file:
+                parts = line.split()
+                if parts[2] not in self.disks:
+                    continue
+                counters["disk_reads"] += int(parts[3])
+                counters["disk_read_sectors"] += int(parts[5])
+                counters["disk_writes"] += int(parts[7])
+                counters["disk_write_sectors"] += int(parts[9])
+                counters["disk_io_ticks"][parts[2]] = int(parts[12])
+        return counters
+
+    def read_network(self):
+        """Cumulative bytes received and sent on every interface except loopback."""
+        counters = {"net_rx_bytes": 0, "net_tx_bytes": 0}
+        with open("/proc/net/dev") as file:
+            for line in file.readlines()[2:]:
+                name, values = line.split(":", 1)
+                if name.strip() == "lo":
+                    continue
+                values = values.split()
+                counters["net_rx_bytes"] += int(values[0])
+                counters["net_tx_bytes"] += int(values[8])
+        return counters
+
+    def read_postgres(self):
+        """
+        Counters of the postmaster's process tree.
+        CPU time also includes the postmaster's reaped children, so short-lived parallel workers
+        that start and exit between two samples are still counted.
+        """
+        processes = {}
+        for pid in os.listdir("/proc"):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f"/proc/{pid}/stat") as file:
+                    stat = file.read()
+            except OSError:
+                continue
+            # The command name is in parentheses and may contain spaces.
+            name = stat[stat.index("(") + 1:stat.rindex(")")]
+            fields = stat[stat.rindex(")") + 2:].split()
+            processes[int(pid)] = {
+                "name": name,
+                "state": fields[0],
+                "ppid": int(fields[1]),
+                "cpu_ticks": int(fields[11]) + int(fields[12]),
+                "child_cpu_ticks": int(fields[13]) + int(fields[14]),
+                "rss_pages": int(fields[21]),
+            }
+
+        roots = [
+            pid for pid, process in processes.items()
+            if process["name"] == self.process_name and processes.get(process["ppid"], {}).get("name") != self.process_name
+        ]
+        tree = set(roots)
+        children = {}
+        for pid, process in processes.items():
+            children.setdefault(process["ppid"], []).append(pid)
+        stack = list(roots)
+        while stack:
+            for child in children.get(stack.pop(), []):
+                if child not in tree:
+                    tree.add(child)
+                    stack.append(child)
+
+        counters = {
+            "pg_processes": len(tree),
+            "pg_parallel_workers": 0,
+            "pg_running": sum(processes[pid]["state"] == "R" for pid in tree),
+            "pg_blocked": sum(processes[pid]["state"] == "D" for pid in tree),
+            "pg_cpu_ticks": sum(processes[pid]["cpu_ticks"] for pid in tree) + sum(processes[pid]["child_cpu_ticks"] for pid in roots),
+            "pg_rss_pages": sum(processes[pid]["rss_pages"] for pid in tree),
+            "pg_io": {},
+        }
+        for pid in tree:
+            try:
+                with open(f"/proc/{pid}/cmdline") as file:
+                    if "parallel worker" in file.read():
+                        counters["pg_parallel_workers"] += 1
+                # Only readable for the same user or root.
+                with open(f"/proc/{pid}/io") as file:
+                    io = dict(line.split(":") for line in file)
+                counters["pg_io"][pid] = (int(io["read_bytes"]), int(io["write_bytes"]))
+            except (OSError, KeyError):
+                continue
+        return counters
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+
+import json
+import signal
+import logging
+from threading import Event
+from resource_sampler import ResourceSampler
+
+stop_event = Event()
+
+def signal_handler(signum, frame):
+    """Handle termination signals."""
+    logging.info(f"Received termination signal ({signum}). Stopping resource sampling...")
+    stop_event.set()
+
+if __name__ == "__main__":
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()]
+    )
+
+    # Load configuration
+    try:
+        with open("generator_config.json", "r") as file:
+            config = json.load(file)
+    except Exception as e:
+        logging.error(f"Failed to load configuration: {e}")
+        exit(1)
+
+    sampler_config = config.get("resource_sampler", {})
+    sampler = ResourceSampler(
+        interval=sampler_config.get("interval", 1.0),
+        output_folder=sampler_config.get("output_folder", "logs/resources"),
+        process_name=sampler_config.get("process_name", "postgres")
+    )
+
+    # Attach signal handlers
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    # Sample until interrupted
+    sampler.start()
+    stop_event.wait()
+    sampler.stop()
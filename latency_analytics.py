@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+
+import argparse
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from visualizer import INDEX_LABELS, SIZE_UNITS, TABLE_PATTERN, finish_figure
+
+# Where BenchmarkRunner writes latencies, relative to the repository root: runs from Client/ and local harness runs.
+LATENCIES_GLOBS = [
+    os.path.join("Client", "results", "*", "latencies", "*_latencies.csv"),
+    os.path.join("results", "*", "latencies", "*_latencies.csv"),
+    os.path.join("local_runs", "*", "results", "*", "latencies", "*_latencies.csv"),
+]
+ANALYTICS_DIR = os.path.join("visualize_results", "latency_analytics")
+# Latency files are named by BenchmarkRunner.run_name: <table>_<queries>q_<clients>c[_<query type>]_latencies.csv
+RUN_PATTERN = re.compile(
+    r"^(?P<table_name>.+)_(?P<num_queries>\d+)q_(?P<num_clients>\d+)c(?:_(?P<query_type>[a-z]+))?_latencies\.csv$"
+)
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99, "p999": 0.999, "p9999": 0.9999}
+# Runs are only merged at the same concurrency: mixing concurrency levels can look like a bimodal distribution.
+GROUP_KEYS = ["indexing_type", "dimension", "dataset_size", "layout", "query_type", "num_clients"]
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram. Buckets are `buckets_per_decade` per power of ten between `min_value`
+    and `max_value` seconds, so every quantile is known within half a bucket (about 1.2% at 100 per decade)
+    no matter how many samples were added. Histograms with the same layout merge by adding their counts,
+    which lets runs be streamed one file at a time and combined afterwards.
+    """
+
+    def __init__(self, min_value=1e-6, max_value=1e4, buckets_per_decade=100, counts=None):
+        self.min_value = min_value
+        self.max_value = max_value
+        self.buckets_per_decade = buckets_per_decade
+        num_buckets = int(round(np.log10(max_value / min_value) * buckets_per_decade))
+        # Values below min_value land in the first bucket, values above max_value in the last.
+        self.edges = min_value * 10.0 ** (np.arange(num_buckets + 1) / buckets_per_decade)
+        self.midpoints = np.sqrt(self.edges[:-1] * self.edges[1:])
+        self.counts = np.zeros(num_buckets, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def add(self, values):
+        """Add an array of latencies in seconds."""
+        values = np.asarray(values, dtype=np.float64)
+        index = np.floor(np.log10(np.maximum(values, self.min_value) / self.min_value) * self.buckets_per_decade)
+        index = np.clip(index.astype(np.int64), 0, len(self.counts) - 1)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+        return self
+
+    def merge(self, other):
+        """Add another histogram's counts in place."""
+        if len(other.counts) != len(self.counts) or other.min_value != self.min_value:
+            raise ValueError("Only histograms with the same bucket layout can be merged.")
+        self.counts += other.counts
+        return self
+
+    def copy(self):
+        return LatencyHistogram(self.min_value, self.max_value, self.buckets_per_decade, self.counts.copy())
+
+    def quantiles(self, qs):
+        """Bucket midpoints of the given quantiles."""
+        return histogram_quantiles(self.counts[None, :], self.midpoints, qs)[0]
+
+    def cdf(self):
+        """(upper bucket edges, cumulative fraction) over the non-empty range."""
+        cumulative = np.cumsum(self.counts) / max(self.total, 1)
+        used = np.flatnonzero(self.counts)
+        if not len(used):
+            return np.array([]), np.array([])
+        span = slice(used[0], used[-1] + 1)
+        return self.edges[1:][span], cumulative[span]
+
+    def ccdf(self):
+        """(upper bucket edges, fraction of samples above), without the final zero so it can be drawn on log axes."""
+        edges, cumulative = self.cdf()
+        return edges[:-1], 1.0 - cumulative[:-1]
+
+    def save(self, path):
+        np.savez_compressed(
+            path, counts=self.counts, min_value=self.min_value,
+            max_value=self.max_value, buckets_per_decade=self.buckets_per_decade
+        )
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(float(data["min_value"]), float(data["max_value"]), int(data["buckets_per_decade"]), data["counts"])
+
+
+def histogram_quantiles(counts, midpoints, qs):
+    """
+    Quantiles of many histograms at once: `counts` is a (histograms x buckets) matrix.
+    Returns a (histograms x quantiles) matrix; empty histograms give NaN.
+    """
+    qs = np.asarray(qs, dtype=np.float64)
+    cumulative = np.cumsum(counts, axis=1)
+    totals = cumulative[:, -1:]
+    # First bucket whose cumulative count reaches q * total, i.e. the nearest-rank quantile.
+    ranks = np.maximum(np.ceil(qs[None, :] * totals), 1)
+    index = (cumulative[:, None, :] >= ranks[:, :, None]).argmax(axis=2)
+    values = midpoints[index]
+    values[totals[:, 0] == 0] = np.nan
+    return values
+
+
+def bimodality_coefficients(counts, midpoints):
+    """
+    Sarle's bimodality coefficient of log latency for every histogram, (skewness^2 + 1) / kurtosis.
+    Values above 5/9, the coefficient of a uniform distribution, suggest two modes.
+    """
+    counts = counts.astype(np.float64)
+    n = counts.sum(axis=1)
+    x = np.log10(midpoints)[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = (counts * x).sum(axis=1, keepdims=True) / n[:, None]
+        centered = x - mean
+        m2 = (counts * centered ** 2).sum(axis=1) / n
+        m3 = (counts * centered ** 3).sum(axis=1) / n
+        m4 = (counts * centered ** 4).sum(axis=1) / n
+        skewness = m3 / m2 ** 1.5
+        excess_kurtosis = m4 / m2 ** 2 - 3
+        correction = 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        coefficient = (skewness ** 2 + 1) / (excess_kurtosis + correction)
+    coefficient[(n < 4) | (m2 == 0)] = np.nan
+    return coefficient
+
+
+def count_modes(counts, buckets_per_decade, min_share=0.05, max_valley=0.5):
+    """
+    Number of separated peaks in a histogram, after smoothing over a fifth of a decade.
+    A peak counts when its smoothed height is at least `min_share` of the tallest one,
+    and the valley to the previous counted peak drops below `max_valley` of the lower of the two.
+    """
+    width = max(1, buckets_per_decade // 5)
+    smoothed = np.convolve(counts, np.ones(width) / width, mode="same")
+    is_peak = (smoothed[1:-1] > smoothed[:-2]) & (smoothed[1:-1] >= smoothed[2:])
+    peaks = np.flatnonzero(is_peak) + 1
+    if not len(peaks):
+        return 1 if counts.any() else 0
+    peaks = peaks[smoothed[peaks] >= min_share * smoothed[peaks].max()]
+
+    modes = [peaks[0]]
+    for peak in peaks[1:]:
+        valley = smoothed[modes[-1]:peak + 1].min()
+        if valley < max_valley * min(smoothed[modes[-1]], smoothed[peak]):
+            modes.append(peak)
+        elif smoothed[peak] > smoothed[modes[-1]]:
+            modes[-1] = peak
+    return len(modes)
+
+
+def read_latencies(path):
+    """Read one run's latencies in seconds, as written by BenchmarkRunner.save_latencies (a single CSV row)."""
+    return np.loadtxt(path, delimiter=",", ndmin=1, dtype=np.float64)
+
+
+def describe_run(path):
+    """Run metadata parsed from a latency file's path, or None when the name does not follow BenchmarkRunner's scheme."""
+    match = RUN_PATTERN.match(os.path.basename(path))
+    if not match:
+        return None
+
+    run = match.groupdict()
+    table = re.match(TABLE_PATTERN, run["table_name"])
+    return {
+        "benchmark": os.path.basename(os.path.dirname(os.path.dirname(path))),
+        "table_name": run["table_name"],
+        "query_type": run["query_type"] or "vector",
+        "num_queries": int(run["num_queries"]),
+        "num_clients": int(run["num_clients"]),
+        "indexing_type": INDEX_LABELS[table["index"]] if table else None,
+        "dimension": int(table["dimension"]) if table else None,
+        "dataset_size": int(table["size"]) * SIZE_UNITS[table["unit"]] if table else None,
+        "layout": table["layout"] or "monolithic" if table else None,
+        "path": path,
+    }
+
+
+def load_runs(paths):
+    """
+    Stream the latency files one at a time into per-run histograms, so memory stays bounded by one run.
+    Returns the run metadata (one row per file) and the matching list of histograms.
+    """
+    runs, histograms = [], []
+    for path in paths:
+        run = describe_run(path)
+        if run is None:
+            continue
+        samples = read_latencies(path)
+        if not len(samples):
+            continue
+        run.update(
+            samples=len(samples),
+            mean=samples.mean(),
+            min=samples.min(),
+            max=samples.max(),
+        )
+        runs.append(run)
+        histograms.append(LatencyHistogram().add(samples))
+    return pd.DataFrame(runs), histograms
+
+
+def summarize(histograms, index=None):
+    """
+    Tail statistics of many histograms in one vectorized pass: quantiles up to p9999,
+    tail-to-median ratios and bimodality. A quantile is left empty when a histogram
+    holds too few samples to observe it (fewer than 1 / (1 - q)).
+    """
+    if not histograms:
+        return pd.DataFrame()
+    layout = histograms[0]
+    counts = np.stack([histogram.counts for histogram in histograms])
+    totals = counts.sum(axis=1)
+
+    values = histogram_quantiles(counts, layout.midpoints, list(QUANTILES.values()))
+    summary = pd.DataFrame(values, columns=list(QUANTILES), index=index)
+    for name, q in QUANTILES.items():
+        summary.loc[totals < 1 / (1 - q) - 1e-9, name] = np.nan
+
+    summary["p99_p50_ratio"] = summary["p99"] / summary["p50"]
+    summary["p999_p50_ratio"] = summary["p999"] / summary["p50"]
+    summary["bimodality_coefficient"] = bimodality_coefficients(counts, layout.midpoints)
+    summary["modes"] = [count_modes(row, layout.buckets_per_decade) for row in counts]
+    summary["bimodal"] = (summary["bimodality_coefficient"] > 5 / 9) & (summary["modes"] >= 2)
+    return summary
+
+
+def merge_groups(runs, histograms, keys=GROUP_KEYS):
+    """Merge run histograms per group of `keys`. Returns {group tuple: LatencyHistogram}."""
+    merged = {}
+    for (_, run), histogram in zip(runs.iterrows(), histograms):
+        group = tuple(run[key] for key in keys)
+        if group in merged:
+            merged[group].merge(histogram)
+        else:
+            merged[group] = histogram.copy()
+    return merged
+
+
+def plot_ccdf(histograms, title, save_dir=ANALYTICS_DIR, show=True):
+    """
+    Plots the complementary CDF, P(latency > x), of each labelled histogram on log-log axes.
+    Tails show up as the curves' right end: a straight drop is a clean tail, a shoulder or plateau is a spike.
+    """
+    plt.figure(figsize=(10, 6))
+    palette = sns.color_palette("Dark2", len(histograms))
+    for color, (label, histogram) in zip(palette, histograms.items()):
+        edges, ccdf = histogram.ccdf()
+        plt.step(edges, ccdf, where="post", label=label, color=color)
+    plt.xscale("log")
+    plt.yscale("log")
+    plt.xlabel("Latency (s)")
+    plt.ylabel("P(latency > x)")
+    plt.title(title)
+    plt.legend(title="Run")
+    plt.grid(True, which="both", linestyle="--", alpha=0.5)
+    return finish_figure(title, save_dir, show)
+
+
+def plot_cdf(histograms, title, save_dir=ANALYTICS_DIR, show=True):
+    """Plots the CDF of each labelled histogram, with latency on a log axis."""
+    plt.figure(figsize=(10, 6))
+    palette = sns.color_palette("Dark2", len(histograms))
+    for color, (label, histogram) in zip(palette, histograms.items()):
+        edges, cdf = histogram.cdf()
+        plt.step(edges, cdf, where="post", label=label, color=color)
+    plt.xscale("log")
+    plt.xlabel("Latency (s)")
+    plt.ylabel("Fraction of queries")
+    plt.title(title)
+    plt.legend(title="Run")
+    plt.grid(True, which="both", linestyle="--", alpha=0.5)
+    return finish_figure(title, save_dir, show)
+
+
+def group_label(row):
+    """Legend label of a group within one figure: indexing strategy, dataset size and any partitioned layout."""
+    label = f"{row['indexing_type']}, {row['dataset_size']:,}"
+    return label if row["layout"] == "monolithic" else f"{label}, {row['layout']}"
+
+
+def plot_tail_percentiles(group_summary, title, save_dir=ANALYTICS_DIR, show=True):
+    """
+    Plots p50 through p9999 of each group on a log axis, one line per indexing strategy, dataset size and layout.
+    Pass the groups of one dimension, query type and concurrency, so no line averages different runs.
+    Unlike the visualizer's p99 boxplots this is computed from every recorded query, so tail spikes stay visible.
+    """
+    long = group_summary.assign(label=group_summary.apply(group_label, axis=1)).melt(
+        id_vars=["label"], value_vars=list(QUANTILES), var_name="percentile", value_name="latency"
+    ).dropna()
+    plt.figure(figsize=(10, 6))
+    sns.pointplot(
+        data=long, x="percentile", y="latency", hue="label", palette="Dark2",
+        order=list(QUANTILES), errorbar=None, dodge=0.3 if long["label"].nunique() > 1 else False
+    )
+    plt.yscale("log")
+    plt.xlabel("Percentile")
+    plt.ylabel("Latency (s)")
+    plt.title(title)
+    plt.legend(title="Run")
+    plt.grid(True, which="both", linestyle="--", alpha=0.5)
+    return finish_figure(title, save_dir, show)
+
+
+def analyze(paths, save_dir=ANALYTICS_DIR, show=False):
+    """
+    Summarize every run and every group of runs, write the tables and merged histograms to `save_dir`,
+    and plot per-group CCDFs and CDFs. Returns the per-run and per-group summaries.
+    """
+    if not os.path.exists(save_dir):
+        os.makedirs(save_dir)
+
+    runs, histograms = load_runs(paths)
+    if runs.empty:
+        return runs, runs
+
+    run_summary = pd.concat([runs.drop(columns="path"), summarize(histograms, runs.index)], axis=1)
+    run_summary.to_csv(os.path.join(save_dir, "run_tails.csv"), index=False)
+
+    merged = merge_groups(runs, histograms)
+    groups = pd.DataFrame(list(merged), columns=GROUP_KEYS)
+    groups["samples"] = [histogram.total for histogram in merged.values()]
+    group_summary = pd.concat([groups, summarize(list(merged.values()))], axis=1)
+    group_summary.to_csv(os.path.join(save_dir, "group_tails.csv"), index=False)
+
+    for group, histogram in merged.items():
+        histogram.save(os.path.join(save_dir, "histogram_" + "_".join(str(part) for part in group) + ".npz"))
+
+    # One set of figures per dimension, query type and concurrency, comparing indexing strategies, sizes and layouts.
+    for (dimension, query_type, num_clients), rows in group_summary.groupby(["dimension", "query_type", "num_clients"]):
+        rows = rows.sort_values(["indexing_type", "dataset_size", "layout"])
+        labelled = {group_label(row): merged[tuple(row[GROUP_KEYS])] for _, row in rows.iterrows()}
+        suffix = f"{dimension}D, {query_type}, {num_clients} clients"
+        plot_ccdf(labelled, f"Latency CCDF, {suffix}", save_dir, show)
+        plot_cdf(labelled, f"Latency CDF, {suffix}", save_dir, show)
+        plot_tail_percentiles(rows, f"Tail Latency, {suffix}", save_dir, show)
+
+    for row in group_summary[group_summary["bimodal"]].itertuples():
+        print(f"Bimodal latencies: {row.indexing_type} {row.dimension}D {row.dataset_size:,} rows {row.layout} "
+              f"({row.query_type}, {row.num_clients} clients), coefficient {row.bimodality_coefficient:.2f}, {row.modes} modes.")
+    return run_summary, group_summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tail latency analytics from the raw per-query latency files.")
+    parser.add_argument("paths", nargs="*", help=f"Latency CSV files (default: {', '.join(LATENCIES_GLOBS)})")
+    parser.add_argument("--save-dir", default=ANALYTICS_DIR, help="Directory for the tables, histograms and figures")
+    args = parser.parse_args()
+
+    matplotlib.use("Agg")
+    sns.set_style("whitegrid")
+    paths = args.paths or sorted(path for pattern in LATENCIES_GLOBS for path in glob.glob(pattern))
+    if not paths:
+        parser.error(f"No latency files given and none found matching {', '.join(LATENCIES_GLOBS)}.")
+    run_summary, group_summary = analyze(paths, args.save_dir)
+    print(f"Analyzed {len(run_summary)} runs in {len(group_summary)} groups; results in {args.save_dir}.")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import psycopg2
+
+# The Server and Client modules import their siblings directly, as when run from their own folders.
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(ROOT, "Server"), os.path.join(ROOT, "Client")]
+
+from data_generator import DataGenerator
+from benchmark_runner import BenchmarkRunner
+from resource_sampler import ResourceSampler
+
+
+class LocalCluster:
+    """
+    Throwaway PostgreSQL cluster in a temporary directory, for running the whole pipeline offline.
+    The cluster is initialized with `initdb`, configured from `postgresql_conf` only, and reachable
+    through a Unix socket in the same directory, so it never touches another server or a TCP port.
+    """
+
+    def __init__(self, cluster_config):
+        self.config = cluster_config
+        self.port = cluster_config.get("port", 54329)
+        self.dbname = cluster_config.get("dbname", "test_db")
+        self.keep = cluster_config.get("keep", False)
+        self.bin_dir = self.find_bin_dir()
+        self.base_dir = None
+        self.data_dir = None
+        self.started = False
+
+    def find_bin_dir(self):
+        """The configured bin_dir, or the one `pg_config` reports, or the PATH."""
+        if self.config.get("bin_dir"):
+            return self.config["bin_dir"]
+        try:
+            bin_dir = subprocess.run(["pg_config", "--bindir"], capture_output=True, text=True, check=True).stdout.strip()
+            if os.path.exists(os.path.join(bin_dir, "initdb")):
+                return bin_dir
+        except (OSError, subprocess.CalledProcessError):
+            pass
+        initdb = shutil.which("initdb")
+        if not initdb:
+            raise RuntimeError("PostgreSQL server binaries not found; set cluster.bin_dir to the folder containing initdb.")
+        return os.path.dirname(initdb)
+
+    def run(self, program, *args):
+        """Run a PostgreSQL program, raising with its output on failure."""
+        result = subprocess.run([os.path.join(self.bin_dir, program), *args], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{program} failed: {result.stderr.strip() or result.stdout.strip()}")
+        return result.stdout
+
+    @property
+    def db_config(self):
+        """Connection settings in the format of the generator's and the client's `db` blocks."""
+        return {"host": self.base_dir, "port": self.port, "dbname": self.dbname, "user": "postgres", "password": ""}
+
+    def start(self):
+        """Initialize, configure and start the cluster, then create the benchmark database and its extensions."""
+        if os.geteuid() == 0:
+            raise RuntimeError("initdb refuses to run as root; run the local benchmark as an unprivileged user.")
+
+        self.base_dir = tempfile.mkdtemp(prefix="pgvector_bench_")
+        self.data_dir = os.path.join(self.base_dir, "data")
+        self.run("initdb", "-D", self.data_dir, "-U", "postgres", "--auth=trust", "--encoding=UTF8", "--no-sync")
+        self.write_conf()
+
+        log_path = os.path.join(self.base_dir, "postgresql.log")
+        try:
+            self.run("pg_ctl", "-D", self.data_dir, "-l", log_path, "-w", "start")
+        except RuntimeError:
+            with open(log_path) as file:
+                logging.error(f"PostgreSQL did not start:\n{file.read()[-2000:]}")
+            raise
+        self.started = True
+        logging.info(f"Started PostgreSQL {self.run('postgres', '--version').split()[-1]} in {self.base_dir}.")
+
+        conn = psycopg2.connect(**{**self.db_config, "dbname": "postgres"})
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE {self.dbname};")
+        conn.close()
+
+        conn = psycopg2.connect(**self.db_config)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            for extension in self.config.get("extensions", ["vector"]):
+                cursor.execute(f"CREATE EXTENSION IF NOT EXISTS {extension};")
+        conn.close()
+
+    def write_conf(self):
+        """Append the connection settings and the configured settings to postgresql.conf; later lines win."""
+        settings = {
+            "listen_addresses": "",
+            "unix_socket_directories": self.base_dir,
+            "port": self.port,
+            **self.config.get("postgresql_conf", {}),
+        }
+        with open(os.path.join(self.data_dir, "postgresql.conf"), "a") as file:
+            file.write("\n# Local benchmark settings\n")
+            for name, value in settings.items():
+                value = f"'{value}'" if isinstance(value, str) else str(value).lower() if isinstance(value, bool) else value
+                file.write(f"{name} = {value}\n")
+
+    def analyze(self):
+        """Collect planner statistics, since autovacuum may be disabled for repeatability."""
+        conn = psycopg2.connect(**self.db_config)
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            cursor.execute("ANALYZE;")
+        conn.close()
+
+    def stop(self):
+        """Stop the cluster and remove its directory, unless `keep` is set."""
+        if self.started:
+            try:
+                self.run("pg_ctl", "-D", self.data_dir, "-m", "fast", "-w", "stop")
+            except RuntimeError as e:
+                logging.error(f"Failed to stop PostgreSQL: {e}")
+            self.started = False
+        if self.base_dir and not self.keep:
+            shutil.rmtree(self.base_dir, ignore_errors=True)
+        elif self.base_dir:
+            logging.info(f"Cluster kept in {self.base_dir}.")
+
+    def __enter__(self):
+        try:
+            self.start()
+        except BaseException:
+            self.stop()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def reset_logging():
+    """Drop the root handlers, so the next component's logging.basicConfig takes effect."""
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+
+
+def run_local_benchmark(config):
+    """
+    Start a local cluster, load the scaled-down dataset with DataGenerator, benchmark it with BenchmarkRunner
+    and tear the cluster down. Logs and results are written to a new folder under `output_dir`.
+    """
+    generator_config = config["generator"]
+    benchmark_config = config["benchmark"]
+    if "dataset" in generator_config:
+        # The generator runs from the output folder, so dataset files are resolved against the caller's directory first.
+        dataset = dict(generator_config["dataset"])
+        for key in ("path", "queries_path", "ground_truth_path"):
+            if dataset.get(key):
+                dataset[key] = os.path.abspath(dataset[key])
+        generator_config = {**generator_config, "dataset": dataset}
+    sampler_config = config.get("resource_sampler", {})
+
+    current_time = time.strftime("%Y%m%d-%H%M%S")
+    output_dir = os.path.abspath(os.path.join(config.get("output_dir", "local_runs"), f"local_{current_time}"))
+    os.makedirs(output_dir)
+    with open(os.path.join(output_dir, "local_benchmark_config.json"), "w") as file:
+        json.dump(config, file, indent=2)
+
+    working_dir = os.getcwd()
+    sampler = None
+    with LocalCluster(config["cluster"]) as cluster:
+        # The generator and the runner write logs/ and results/ relative to the working directory.
+        os.chdir(output_dir)
+        try:
+            if sampler_config.get("enabled", False):
+                sampler = ResourceSampler(sampler_config.get("interval", 1.0), os.path.join(output_dir, "resources"))
+                sampler.start()
+
+            # Without session_settings the generator and runner would override the cluster's postgresql.conf.
+            generator = DataGenerator({"generator": {"session_settings": {}, **generator_config}, "db": cluster.db_config})
+            if not generator.start():
+                raise RuntimeError("Data generation failed, see the generator log.")
+            cluster.analyze()
+
+            # The client mirrors the generator's seeds and vocabulary, so its queries match the generated data.
+            text_config = generator_config.get("text", {})
+            hybrid_config = {
+                **benchmark_config.get("hybrid", {}),
+                "seed": generator_config["seed"],
+                "vocabulary_size": text_config.get("vocabulary_size", 10000),
+                "zipf_exponent": text_config.get("zipf_exponent", 1.1),
+                "language": text_config.get("language", "simple"),
+            }
+            partitioning = generator_config.get("partitioning", {})
+
+            reset_logging()
+            runner = BenchmarkRunner(
+                tables=benchmark_config.get("tables") or list(generator.generator_config["tables"]),
+                query_configs=benchmark_config["query_configs"],
+                dimensions=generator.embeddings.dimensions,
+                db_config=cluster.db_config,
+                query_distribution={**generator_config.get("distribution", {}), "seed": generator_config["seed"]},
+                ground_truth_table=generator.ground_truth_table,
+                top_k=benchmark_config.get("top_k", 5),
+                query_types=benchmark_config.get("query_types"),
+                hybrid_config=hybrid_config,
+                num_tenants=partitioning.get("tenants") if partitioning.get("enabled", False) else None,
+                recall_sample=benchmark_config.get("recall_sample", 0),
+                tracing_config=benchmark_config.get("tracing"),
+                resource_samples=os.path.join(output_dir, "resources", "*.csv") if sampler else None,
+                session_settings=benchmark_config.get("session_settings", {})
+            )
+            runner.start()
+        finally:
+            if sampler:
+                sampler.stop()
+            os.chdir(working_dir)
+
+    logging.info(f"Local benchmark finished, results in {output_dir}.")
+    return output_dir
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()]
+    )
+
+    parser = argparse.ArgumentParser(description="Run the generator and the benchmark against a throwaway local PostgreSQL cluster.")
+    parser.add_argument("--config", default="local_benchmark_config.json", help="Harness configuration file")
+    parser.add_argument("--keep", action="store_true", help="Keep the cluster's directory for inspection")
+    args = parser.parse_args()
+
+    try:
+        with open(args.config, "r") as file:
+            config = json.load(file)
+    except Exception as e:
+        logging.error(f"Failed to load configuration: {e}")
+        sys.exit(1)
+
+    if args.keep:
+        config["cluster"]["keep"] = True
+    run_local_benchmark(config)
@@ -1,105 +1,217 @@
+#!/usr/bin/env python3
+
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+RESULTS_DIR = "visualize_results"
+CACHE_DIR = ".visualizer_cache"
+MANIFEST_FILE = ".report_manifest.json"
+# Bump when a plot changes, so the report re-renders figures whose inputs did not change.
+REPORT_VERSION = 2
+# Bump when parsing changes, so cached parses and aggregates of unchanged files are rebuilt.
+PARSER_VERSION = 2
 
-def load_results(result128, result256, result512):
-    """Loads the results from the CSV files and concatenates them into a single DataFrame."""
+INDEX_LABELS = {"no_index": "No Index", "ivfflat": "IVFFlat", "hnsw": "HNSW"}
+SIZE_UNITS = {"": 1, "K": 1_000, "M": 1_000_000}
+# Partitioned variants carry a layout suffix, e.g. items_hnsw_128_5M_hash8.
+TABLE_PATTERN = r"^items_(?P<index>no_index|ivfflat|hnsw)_(?P<dimension>\d+)_(?P<size>\d+)(?P<unit>[KM]?)(?:_(?P<layout>(?:hash|list)\d+))?$"
+GROUP_KEYS = ["dimension", "dataset_size", "indexing_type", "layout", "query_type"]
+METRICS = [
+    "avg_latency", "p50_latency", "p90_latency", "p95_latency", "p99_latency",
+    "throughput", "overall_throughput"
+]
+
+# In-process memo of parsed result files and aggregate tables, keyed on content hashes.
+_frames = {}
+_aggregates = {}
+
+
+def file_hash(path):
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-    # Load the benchmark result files
-    df_128 = pd.read_csv("visualize_results/128.csv")
-    df_256 = pd.read_csv("visualize_results/256.csv")
-    df_512 = pd.read_csv("visualize_results/512.csv")
 
-    # Add dimension column to differentiate datasets
-    df_128["dimension"] = 128
-    df_256["dimension"] = 256
-    df_512["dimension"] = 512
+def combined_hash(parts):
+    """Order-independent hash of several hashes."""
+    return hashlib.sha256("".join(sorted(parts)).encode()).hexdigest()
 
-    # Merge all datasets into a single DataFrame
-    df_all = pd.concat([df_128, df_256, df_512], ignore_index=True)
 
-    # Extract dataset size and indexing type from the table_name column
-    df_all["dataset_size"] = df_all["table_name"].apply(lambda x: "500K" if "500K" in x else "1M" if "1M" in x else "5M")
-    df_all["indexing_type"] = df_all["table_name"].apply(lambda x: "No Index" if "no_index" in x else ("IVFFlat" if "ivfflat" in x else "HNSW"))
+def disk_cached(kind, key, build):
+    """
+    Return a pickled value from the on-disk cache, building and storing it on a miss.
+    Entries are written to a temporary file and renamed into place, so an interrupted run never
+    leaves a truncated entry; one that cannot be unpickled anyway is rebuilt.
+    """
+    path = os.path.join(CACHE_DIR, f"{kind}_{key}.pkl")
+    if os.path.exists(path):
+        try:
+            with open(path, "rb") as file:
+                return pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            print(f"Ignoring unreadable cache entry {path}: {e}")
+
+    value = build()
+    if not os.path.exists(CACHE_DIR):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=CACHE_DIR, prefix=f"{kind}_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(value, file)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return value
 
-    # Convert dataset_size to numeric for proper ordering
-    df_all["dataset_size"] = df_all["dataset_size"].map({"500K": 500000, "1M": 1000000, "5M": 5000000})
+
+def parse_results(df):
+    """Derive dimension, dataset_size and indexing_type from table_name in one vectorized pass."""
+    parts = df["table_name"].str.extract(TABLE_PATTERN)
+    df["dimension"] = pd.to_numeric(parts["dimension"])
+    df["dataset_size"] = pd.to_numeric(parts["size"]) * parts["unit"].map(SIZE_UNITS)
+    df["indexing_type"] = pd.Categorical(parts["index"].map(INDEX_LABELS), categories=list(INDEX_LABELS.values()))
+    df["layout"] = parts["layout"].fillna("monolithic")
+    # Results written before query types existed only hold vector runs.
+    df["query_type"] = df["query_type"].fillna("vector") if "query_type" in df else "vector"
 
     # Calculate throughput manually to ensure correctness
-    df_all["overall_throughput"] = df_all["num_queries"] / df_all["elapsed_time"]
+    df["overall_throughput"] = df["num_queries"] / df["elapsed_time"]
+    return df
+
+
+def load_result_file(path):
+    """Load and parse one results CSV, cached on its content hash and the parser version. Returns (key, DataFrame)."""
+    key = hashlib.sha256(f"{file_hash(path)}:{PARSER_VERSION}".encode()).hexdigest()
+    if key not in _frames:
+        _frames[key] = disk_cached("results", key, lambda: parse_results(pd.read_csv(path)))
+    return key, _frames[key]
 
+
+def load_results(*paths):
+    """Loads the results from the CSV files and concatenates them into a single DataFrame."""
+    keys, frames = zip(*(load_result_file(path) for path in paths))
+    df_all = pd.concat(frames, ignore_index=True)
+    df_all.attrs["source_hash"] = combined_hash(keys)
     return df_all
 
-def plot_latency_heatmap_size(df):
+
+def aggregate(df):
+    """
+    Mean of every metric per dimension, dataset size, indexing type, layout and query type: the single aggregate table the plots share.
+    Memoized in-process and on disk under the hash of the result files the DataFrame was loaded from and of its rows,
+    since pandas carries attrs over to filtered frames.
+    """
+    def build():
+        return df.groupby(GROUP_KEYS, as_index=False, observed=True)[METRICS].mean()
+
+    source_hash = df.attrs.get("source_hash")
+    if source_hash is None:
+        return build()
+    rows_hash = hashlib.sha256(pd.util.hash_pandas_object(df.index).values.tobytes()).hexdigest()
+    key = combined_hash([source_hash, rows_hash])
+    if key not in _aggregates:
+        _aggregates[key] = disk_cached("aggregate", key, build)
+    return _aggregates[key]
+
+
+def baseline(df):
+    """
+    Rows of monolithic tables under plain vector queries: the setting the comparison plots are made for.
+    Partitioned layouts and text, hybrid or tenant queries would otherwise be averaged into the same points.
+    """
+    return df[(df["query_type"] == "vector") & (df["layout"] == "monolithic")]
+
+
+def finish_figure(file_title, save_dir, show):
+    """Save the current figure as `<save_dir>/<file_title>.png`, then show it or close it."""
+    path = os.path.join(save_dir, f"{file_title}.png")
+    plt.savefig(path)
+    if show:
+        plt.show()
+    else:
+        plt.close()
+    return path
+
+
+def plot_latency_heatmap_size(df, save_dir=RESULTS_DIR, show=True):
     """Generates a heatmap for average latency comparisons across indexing strategies and dataset sizes."""
     plt.figure(figsize=(8, 6))
-    df_agg = df.groupby(["dataset_size", "indexing_type"], as_index=False).agg({"avg_latency": "mean"})
-    pivot_latency = df_agg.pivot(index="dataset_size", columns="indexing_type", values="avg_latency")
+    pivot_latency = baseline(aggregate(df)).pivot_table(index="dataset_size", columns="indexing_type", values="avg_latency", observed=True)
     title = "Average Latency by Indexing Strategy and Dataset Size"
     sns.heatmap(pivot_latency, annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5)
     plt.xlabel("Indexing Strategy")
     plt.ylabel("Dataset Size (Rows)")
     plt.title(title)
-    plt.savefig(f"visualize_results/{title}.png")
-    plt.show()
+    return finish_figure(title, save_dir, show)
 
-def plot_latency_heatmap_dims(df):
+def plot_latency_heatmap_dims(df, save_dir=RESULTS_DIR, show=True):
     """Generates a heatmap for average latency comparisons across indexing strategies and dataset sizes."""
     plt.figure(figsize=(8, 6))
-    df_agg = df.groupby(["dimension", "indexing_type"], as_index=False).agg({"avg_latency": "mean"})
-    pivot_latency = df_agg.pivot(index="dimension", columns="indexing_type", values="avg_latency")
+    pivot_latency = baseline(aggregate(df)).pivot_table(index="dimension", columns="indexing_type", values="avg_latency", observed=True)
     title = "Average Latency by Indexing Strategy and Dimensions"
     sns.heatmap(pivot_latency, annot=True, cmap="coolwarm", fmt=".2f", linewidths=0.5)
     plt.xlabel("Indexing Strategy")
     plt.ylabel("Dimensions")
     plt.title("Average Latency by Indexing Strategy and Dimensions")
-    plt.savefig(f"visualize_results/{title}.png")
-    plt.show()
+    return finish_figure(title, save_dir, show)
 
 
-def plot_latency_vs_dimension(df):
+def plot_latency_vs_dimension(df, save_dir=RESULTS_DIR, show=True):
     """Generates a line chart comparing latency across different embedding dimensions for each indexing strategy."""
     title = "Average Latency by Embedding Dimensionality"
     plt.figure(figsize=(10, 6))
-    sns.lineplot(data=df, x="dimension", y="avg_latency", hue="indexing_type", marker="o", palette="Dark2")
+    sns.lineplot(data=baseline(aggregate(df)), x="dimension", y="avg_latency", hue="indexing_type", marker="o", palette="Dark2", errorbar=None)
     plt.xlabel("Embedding Dimensionality")
     plt.ylabel("Average Latency (s)")
     plt.title("Impact of Embedding Dimensionality on Latency")
     plt.legend(title="Indexing Strategy")
     plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"visualize_results/{title}.png")
-    plt.show()
+    return finish_figure(title, save_dir, show)
 
 
-def plot_latency_distribution(df):
+def plot_latency_distribution(df, save_dir=RESULTS_DIR, show=True):
     """Generates a boxplot showing latency distributions (p50, p90, p95, p99) for each indexing strategy."""
     plt.figure(figsize=(10, 6))
-    sns.boxplot(data=df, x="indexing_type", y="p99_latency", hue="dataset_size", palette="Set2")
+    sns.boxplot(data=baseline(df), x="indexing_type", y="p99_latency", hue="dataset_size", palette="Set2")
     plt.xlabel("Indexing Strategy")
     plt.ylabel("p99 Latency (s)")
     plt.title("Latency Distribution Across Indexing Strategies")
     plt.legend(title="Dataset Size")
     plt.grid(axis="y", linestyle="--", alpha=0.7)
-    plt.savefig("visualize_results/Latency Distribution Across Indexing Strategies.png")
-    plt.show()
+    return finish_figure("Latency Distribution Across Indexing Strategies, all", save_dir, show)
 
 
-def plot_latency_distribution_only_index(df):
+def plot_latency_distribution_only_index(df, save_dir=RESULTS_DIR, show=True):
     """Generates a boxplot showing latency distributions (p50, p90, p95, p99) for each indexing strategy."""
+    df = baseline(df)
     df = df[df["indexing_type"].isin(["IVFFlat", "HNSW"])]
     plt.figure(figsize=(10, 6))
-    sns.boxplot(data=df, x="indexing_type", y="p99_latency", hue="dataset_size", palette="Set2")
+    sns.boxplot(data=df, x="indexing_type", y="p99_latency", hue="dataset_size", palette="Set2", order=["IVFFlat", "HNSW"])
     plt.xlabel("Indexing Strategy")
     plt.ylabel("p99 Latency (s)")
     plt.title("Latency Distribution Across Indexing Strategies")
     plt.legend(title="Dataset Size")
     plt.grid(axis="y", linestyle="--", alpha=0.7)
-    plt.savefig("visualize_results/Latency Distribution Across Indexing Strategies.png")
-    plt.show()
+    return finish_figure("Latency Distribution Across Indexing Strategies", save_dir, show)
 
 
-def plot_throughput_vs_indexing(df, overall_throughput=True):
+def plot_throughput_vs_indexing(df, overall_throughput=True, save_dir=RESULTS_DIR, show=True):
     """Generates a bar chart comparing query throughput across indexing strategies and dataset sizes.
        If overall_throughput is False, results don't include the time between queries.
     """
@@ -107,75 +219,181 @@ def plot_throughput_vs_indexing(df, overall_throughput=True):
     thr_title = "Throughput" if overall_throughput else "Throughput"
 
     plt.figure(figsize=(10, 6))
-    sns.barplot(data=df, x="indexing_type", y=thr, hue="dataset_size", palette="pastel")
+    sns.barplot(data=baseline(aggregate(df)), x="indexing_type", y=thr, hue="dataset_size", palette="pastel", errorbar=None)
     plt.xlabel("Indexing Strategy")
     plt.ylabel(f"{thr_title} (queries/sec)")
     plt.title(f"{thr_title} Across Indexing Strategies")
     plt.legend(title="Dataset Size")
     plt.grid(axis="y", linestyle="--", alpha=0.7)
-    plt.savefig(f"visualize_results/{thr_title} Across Indexing Strategies.png")
-    plt.show()
+    return finish_figure(f"{thr_title} Across Indexing Strategies", save_dir, show)
 
-def plot_latency_vs_indexing(df):
+def plot_latency_vs_indexing(df, save_dir=RESULTS_DIR, show=True):
     """Generates a bar chart comparing query throughput across indexing strategies and dataset sizes.
        If overall_throughput is False, results don't include the time between queries.
     """
-    df = df[df["indexing_type"].isin(["IVFFlat", "HNSW"])]
+    df_agg = baseline(aggregate(df))
+    df_agg = df_agg[df_agg["indexing_type"].isin(["IVFFlat", "HNSW"])]
     plt.figure(figsize=(10, 6))
-    sns.barplot(data=df, x="indexing_type", y="avg_latency", hue="dataset_size", palette="pastel")
+    sns.barplot(data=df_agg, x="indexing_type", y="avg_latency", hue="dataset_size", palette="pastel", order=["IVFFlat", "HNSW"], errorbar=None)
     plt.xlabel("Indexing Strategy")
     plt.ylabel(f"Latency (sec)")
     plt.title(f"Latency Across Indexing Strategies")
     plt.legend(title="Dataset Size")
     plt.grid(axis="y", linestyle="--", alpha=0.7)
-    plt.savefig(f"visualize_results/Latency Across Indexing Strategies.png")
-    plt.show()
+    return finish_figure("Latency Across Indexing Strategies", save_dir, show)
 
-def plot_scalability(df, indexing_types=["IVFFlat", "HNSW", "No Index"], dimensions=[128, 256, 512]):
+def plot_scalability(df, indexing_types=["IVFFlat", "HNSW", "No Index"], dimensions=[128, 256, 512], save_dir=RESULTS_DIR, show=True):
     """Generates a line chart showing how latency scales with dataset size for each indexing strategy."""
-    df = df[df["indexing_type"].isin(indexing_types)]
-    df = df[df["dimension"].isin(dimensions)]
+    df_agg = baseline(aggregate(df))
+    df_agg = df_agg[df_agg["indexing_type"].isin(indexing_types)]
+    df_agg = df_agg[df_agg["dimension"].isin(dimensions)]
+    df_agg = df_agg.assign(indexing_type=df_agg["indexing_type"].cat.remove_unused_categories())
     plt.figure(figsize=(10, 6))
-    sns.lineplot(data=df, x="dataset_size", y="avg_latency", hue="indexing_type", marker="o", palette="Dark2")
+    sns.lineplot(data=df_agg, x="dataset_size", y="avg_latency", hue="indexing_type", marker="o", palette="Dark2", errorbar=None)
     plt.xlabel("Dataset Size (Rows)")
     plt.ylabel("Average Latency (s)")
     plt.title(f"Scalability: Dataset Size vs. Latency Across Indexing Strategies, dimensions {dimensions}")
     plt.legend(title="Indexing Strategy")
     plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"visualize_results/Scalability: Dataset Size vs. Latency Across Indexing Strategies, dimensions {dimensions}.png")
-    plt.show()
+    return finish_figure(f"Scalability: Dataset Size vs. Latency Across Indexing Strategies, dimensions {dimensions}", save_dir, show)
 
 
-def plot_throughput_vs_dimension(df, overall_throughput=True):
+def plot_throughput_vs_dimension(df, overall_throughput=True, save_dir=RESULTS_DIR, show=True):
     """Generates a line chart showing query throughput across different embedding dimensions for each indexing strategy.
        If overall_throughput is False, results don't include the time between queries.
     """
     thr = "overall_throughput" if overall_throughput else "throughput"
     thr_title = "Throughput" if overall_throughput else "Throughput"
     plt.figure(figsize=(10, 6))
-    sns.lineplot(data=df, x="dimension", y=thr, hue="indexing_type", marker="o", palette="Dark2")
+    sns.lineplot(data=baseline(aggregate(df)), x="dimension", y=thr, hue="indexing_type", marker="o", palette="Dark2", errorbar=None)
     plt.xlabel("Embedding Dimensionality")
     plt.ylabel(f"{thr_title} (queries/sec)")
     plt.title(f"{thr_title} Across Different Embedding Dimensions")
     plt.legend(title="Indexing Strategy")
     plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"visualize_results/{thr_title} Across Different Embedding Dimensions.png")
-    plt.show()
+    return finish_figure(f"{thr_title} Across Different Embedding Dimensions", save_dir, show)
 
 
-def plot_throughput_vs_dataset_size(df, overall_throughput=True):
+def plot_throughput_vs_dataset_size(df, overall_throughput=True, save_dir=RESULTS_DIR, show=True):
     """Generates a line chart showing query throughput across different dataset sizes for each indexing strategy.
        If overall_throughput is False, results don't include the time between queries.
     """
     thr = "overall_throughput" if overall_throughput else "throughput"
     thr_title = "Throughput" if overall_throughput else "Throughput"
     plt.figure(figsize=(10, 6))
-    sns.lineplot(data=df, x="dataset_size", y=thr, hue="indexing_type", marker="o", palette="Set1")
+    sns.lineplot(data=baseline(aggregate(df)), x="dataset_size", y=thr, hue="indexing_type", marker="o", palette="Set1", errorbar=None)
     plt.xlabel("Dataset Size (Rows)")
     plt.ylabel(f"{thr_title} (queries/sec)")
     plt.title(f"{thr_title} Across Different Dataset Sizes")
     plt.legend(title="Indexing Strategy")
     plt.grid(True, linestyle="--", alpha=0.7)
-    plt.savefig(f"visualize_results/{thr_title} Across Different Dataset Sizes.png")
-    plt.show()
+    return finish_figure(f"{thr_title} Across Different Dataset Sizes", save_dir, show)
+
+
+def report_plots(dimensions):
+    """The report's plots, as in visualize.ipynb: (function name, keyword arguments, dimensions the plot reads or None for all)."""
+    plots = [
+        ("plot_latency_heatmap_size", {}, None),
+        ("plot_latency_heatmap_dims", {}, None),
+        ("plot_latency_vs_dimension", {}, None),
+        ("plot_throughput_vs_dimension", {}, None),
+        ("plot_latency_distribution", {}, None),
+        ("plot_latency_distribution_only_index", {}, None),
+        ("plot_latency_vs_indexing", {}, None),
+        ("plot_throughput_vs_indexing", {}, None),
+        ("plot_scalability", {"dimensions": dimensions}, None),
+        ("plot_scalability", {"indexing_types": ["IVFFlat", "HNSW"], "dimensions": dimensions}, None),
+        ("plot_throughput_vs_dataset_size", {}, None),
+    ]
+    for dimension in dimensions:
+        plots.append(("plot_scalability", {"indexing_types": ["IVFFlat", "HNSW"], "dimensions": [dimension]}, [dimension]))
+    return plots
+
+
+def render_plot(function_name, kwargs, df, save_dir):
+    """Render one plot headlessly. Runs in a worker process; returns the saved figure's file name."""
+    matplotlib.use("Agg")
+    sns.set_style("whitegrid")
+    path = globals()[function_name](df, save_dir=save_dir, show=False, **kwargs)
+    return os.path.basename(path)
+
+
+def render_report(paths, save_dir=RESULTS_DIR, workers=None):
+    """
+    Load every result file once, then render the report's plots in parallel worker processes into `save_dir`
+    together with a report.html page. A plot is only re-rendered when the result files it reads have changed.
+    """
+    if not os.path.exists(save_dir):
+        os.makedirs(save_dir)
+
+    loaded = [load_result_file(path) for path in paths]
+    df_all = load_results(*paths)
+    aggregate(df_all)
+
+    manifest_path = os.path.join(save_dir, MANIFEST_FILE)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+
+    dimensions = sorted(int(dimension) for dimension in df_all["dimension"].dropna().unique())
+    plots, pending = [], []
+    for function_name, kwargs, plot_dimensions in report_plots(dimensions):
+        # A per-dimension plot only depends on the result files holding that dimension.
+        inputs = [
+            key for key, frame in loaded
+            if plot_dimensions is None or frame["dimension"].isin(plot_dimensions).any()
+        ]
+        plot_id = f"{function_name}({json.dumps(kwargs, sort_keys=True)})"
+        key = combined_hash(inputs + [f"{REPORT_VERSION}:{plot_id}"])
+        plots.append(plot_id)
+
+        entry = manifest.get(plot_id)
+        if entry and entry["key"] == key and os.path.exists(os.path.join(save_dir, entry["file"])):
+            continue
+
+        df = df_all if plot_dimensions is None else df_all[df_all["dimension"].isin(plot_dimensions)]
+        pending.append((plot_id, key, function_name, kwargs, df))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (plot_id, key, executor.submit(render_plot, function_name, kwargs, df, save_dir))
+            for plot_id, key, function_name, kwargs, df in pending
+        ]
+        for plot_id, key, future in futures:
+            manifest[plot_id] = {"key": key, "file": future.result()}
+
+    manifest = {plot_id: manifest[plot_id] for plot_id in plots}
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+
+    write_report_page(save_dir, [manifest[plot_id]["file"] for plot_id in plots], paths)
+    print(f"Rendered {len(pending)} of {len(plots)} plots into {save_dir}.")
+
+
+def write_report_page(save_dir, files, paths):
+    """Write a static HTML page showing every rendered figure."""
+    sections = "\n".join(
+        f"<h2>{html.escape(os.path.splitext(file)[0])}</h2>\n<img src=\"{html.escape(file)}\">"
+        for file in files
+    )
+    sources = ", ".join(html.escape(os.path.basename(path)) for path in paths)
+    with open(os.path.join(save_dir, "report.html"), "w") as file:
+        file.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>pgvector Benchmark Report</title>\n"
+            "<style>body { font-family: sans-serif; max-width: 1040px; margin: auto; } img { max-width: 100%; }</style>\n"
+            f"</head>\n<body>\n<h1>pgvector Benchmark Report</h1>\n<p>Results: {sources}</p>\n{sections}\n</body>\n</html>\n"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render all benchmark plots into a static report.")
+    parser.add_argument("paths", nargs="*", help=f"Result CSV files (default: {RESULTS_DIR}/*.csv)")
+    parser.add_argument("--save-dir", default=RESULTS_DIR, help="Directory for the figures and report.html")
+    parser.add_argument("--workers", type=int, default=None, help="Number of rendering processes")
+    args = parser.parse_args()
 
+    paths = args.paths or sorted(glob.glob(os.path.join(RESULTS_DIR, "*.csv")))
+    if not paths:
+        parser.error(f"No result files given and none found in {RESULTS_DIR}.")
+    render_report(paths, args.save_dir, args.workers)